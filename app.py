@@ -10,192 +10,230 @@ than degrading.
 
 from __future__ import annotations
 
-# ruff: noqa: I001 – keep imports grouped for clarity; SocketIO import must
-# precede several local imports.
+import os
+
+# ---------------------------------------------------------------------------
+# Cooperative networking (must run before anything imports socket/threading)
+# ---------------------------------------------------------------------------
+# Under gevent one worker multiplexes every WebSocket on green threads instead
+# of pinning an OS thread per connection.  ``COLLECTOR_ASYNC_MODE=threading``
+# (or a missing gevent install, e.g. local dev) keeps the plain-thread path.
+
+ASYNC_MODE = os.getenv("COLLECTOR_ASYNC_MODE", "gevent")
+if ASYNC_MODE == "gevent":
+    try:
+        from gevent import monkey
+    except ModuleNotFoundError:  # pragma: no cover – gevent not installed
+        ASYNC_MODE = "threading"
+    else:
+        monkey.patch_all()
+
+        # libpq blocks in C and is invisible to monkey-patching; psycogreen
+        # routes psycopg2's waits through the gevent hub instead.
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
+
+# ruff: noqa: I001, E402 – keep imports grouped for clarity; monkey-patching
+# must precede every other import and the SocketIO import must precede several
+# local imports.
 
 import argparse
+import functools
 import hashlib
+import ipaddress
 import logging
-import os
-import json
+import queue
 import socket
+import threading
+import time
 from typing import Any, Dict
 
-# ``flask`` is an optional runtime dependency during *unit* test execution –
-# CI environments may purposefully avoid heavyweight installs (like the full
-# Flask framework) and rely instead on lightweight stubs.  We therefore
-# attempt to import Flask and – if unavailable – register a *minimal* stub
-# exposing just the symbols used by this module so that ``import app``
-# continues to succeed.  The real framework *must* still be present in
-# production images.
-
+import fastjsonschema
+import orjson
 from dotenv import load_dotenv
+from flask import Flask, render_template, request
+from flask.json.provider import DefaultJSONProvider
 
+from flask_socketio import SocketIO  # mandatory dependency
 
-try:
-    from flask import Flask, jsonify, render_template, request
-except ModuleNotFoundError:  # pragma: no cover – stub for CI
-    import sys
-    from types import ModuleType, SimpleNamespace
+from db import get_conn, insert_debug_record, insert_debug_records, insert_event, pool_stats
+from db import init as init_db
+from db import init_buffer as init_db_buffer
 
-    _stub = ModuleType("flask")
+# ---------------------------------------------------------------------------
+# Logging & environment
+# ---------------------------------------------------------------------------
 
-    # -------------------------------------------------------------------
-    # Request and helpers
-    # -------------------------------------------------------------------
 
-    class _FakeRequest:  # noqa: D401 – very thin shim
-        def __init__(self):
-            self.remote_addr = ""
-            self._json = None
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+load_dotenv()
 
-        def get_json(self, force: bool = True):  # noqa: D401 – mimics Flask API
-            return self._json
+# Environment-derived settings are resolved once – they cannot change after
+# process start, so there is no point re-reading ``os.environ`` per request.
 
-    _request = _FakeRequest()
+# Missing env defaults to enabled (prod-friendly), explicit false disables.
+_TRUTHY = {"1", "true", "t", "yes", "y", "on"}
+_EVENTS_ENABLED: bool = os.getenv("COLLECTOR_EVENTS_ENABLED", "1").strip().lower() in _TRUTHY
 
-    def _jsonify(obj):  # noqa: D401 – identity for tests
-        return obj
+# Salt used for ``ip_hash``; when missing, ``ip_hash`` is stored as NULL.
+_salt = os.getenv("EVENT_IP_HASH_SALT")
+_IP_HASH_SALT: bytes | None = _salt.encode("utf-8") if _salt else None
 
-    def _render_template(name):  # noqa: D401 – minimal placeholder
-        return f"<html><body>{name}</body></html>"
+# ---------------------------------------------------------------------------
+# Flask & Socket.IO setup
+# ---------------------------------------------------------------------------
 
-    # -------------------------------------------------------------------
-    # Minimal *App* implementation able to satisfy Flask test client use.
-    # -------------------------------------------------------------------
 
-    class _FakeApp:  # noqa: D401 – sufficient subset for unit tests
-        def __init__(self):
-            self._routes = {}
+class _OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by *orjson*.
 
-        def route(self, rule, methods=None):  # noqa: D401 – mimic decorator
-            methods = tuple(sorted((methods or ["GET"])))
+    Keeps ``render_template`` / ``tojson`` / flashes on the same fast codec the
+    hot POST routes use instead of falling back to the stdlib ``json`` module.
+    """
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=kwargs.get("default", self.default), option=option).decode("utf-8")
 
-            def decorator(func):
-                self._routes[(rule, methods)] = func
-                return func
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
 
-            return decorator
 
-        # A *very* naive test client – good enough for current unit tests.
-        def test_client(self):  # noqa: D401
-            app = self
+app = Flask(__name__)
+app.json = _OrjsonProvider(app)
 
-            class _Client:  # noqa: D401 – inner helper
-                def _dispatch(self, path, method, payload=None):
-                    for (rule, methods), view in app._routes.items():
-                        if rule == path and method in methods:
-                            _request._json = payload
-                            rv = view()
-                            _request._json = None
+# Configure base path for subdirectory deployment (e.g., drose.io/collector)
+APPLICATION_ROOT = os.environ.get("APPLICATION_ROOT", "/")
+app.config["APPLICATION_ROOT"] = APPLICATION_ROOT
 
-                            if isinstance(rv, tuple):
-                                body, status = rv
-                            else:
-                                body, status = rv, 200
 
-                            return SimpleNamespace(
-                                status_code=status,
-                                get_json=lambda: body,
-                            )
-                    return SimpleNamespace(status_code=404, get_json=lambda: None)
+def _prefix_middleware(wsgi_app, prefix: str):
+    """Wrap *wsgi_app* so every request carries ``SCRIPT_NAME=prefix``.
 
-                def get(self, path):  # noqa: D401
-                    return self._dispatch(path, "GET")
+    Handles subdirectory routing so url_for() generates URLs with the correct
+    prefix.  The prefix is fixed at start-up, so the wrapper is a single
+    assignment with no per-request branching.
+    """
 
-                def post(self, path, json=None):  # noqa: D401
-                    return self._dispatch(path, "POST", payload=json)
+    def wrapped(environ, start_response):
+        environ["SCRIPT_NAME"] = prefix
+        return wsgi_app(environ, start_response)
 
-            return _Client()
+    return wrapped
 
-    _stub.Flask = lambda *_args, **_kwargs: _FakeApp()  # type: ignore
-    _stub.jsonify = _jsonify
-    _stub.render_template = _render_template
-    _stub.request = _request
 
-    sys.modules["flask"] = _stub
+if _prefix := APPLICATION_ROOT.rstrip("/"):
+    app.wsgi_app = _prefix_middleware(app.wsgi_app, _prefix)
 
-    from flask import Flask, jsonify, render_template, request  # type: ignore
 
-from flask_socketio import SocketIO  # mandatory dependency
+class _OrjsonSocketCodec:
+    """``json``-module stand-in handed to python-socketio.
 
-# Ensure the *stubbed* ``SocketIO`` used in unit tests provides the ``on``
-# decorator so that ``@socketio.on(...)`` does not raise ``AttributeError``
-# when the real Flask-SocketIO library is not installed.
+    python-socketio encodes every packet via ``json.dumps(data, separators=…)``;
+    orjson always emits the compact form, so the keyword arguments are ignored.
+    """
 
-if not hasattr(SocketIO, "on"):
+    loads = staticmethod(orjson.loads)
 
-    def _noop_on(self, _event):  # noqa: D401 – no-op decorator
-        def decorator(func):  # noqa: D401 – passthrough wrapper
-            return func
+    @staticmethod
+    def dumps(obj: Any, **_kwargs: Any) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
 
-        return decorator
 
-    SocketIO.on = _noop_on  # type: ignore[attr-defined]
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode=ASYNC_MODE, json=_OrjsonSocketCodec)
 
-from db import get_conn, insert_debug_record, insert_event
-from db import init as init_db
+# Bound once so the broadcast hot path skips the attribute lookup per emit.
+_emit = socketio.emit
 
 # ---------------------------------------------------------------------------
-# Logging & environment
+# Database initialisation (started during application import)
 # ---------------------------------------------------------------------------
 
+# When the application is executed under Gunicorn (the recommended production
+# path defined in the Dockerfile) the ``main()`` helper is *not* invoked.  In
+# that code path the database connection pool must therefore be set up from
+# here, at import-time, so that routes – and, crucially, the ``/health``
+# endpoint used by Docker health-checks – can access it.  If the environment
+# is deliberately configured without a database (e.g. local UI-only preview
+# or CI unit tests) we fall back gracefully and keep the application running
+# with persistence disabled.
+#
+# The work itself (connect + migrations) runs on a background thread so the
+# worker can accept requests while it proceeds.  The insert buffer is opened
+# synchronously first: records arriving during start-up are queued and
+# written once the migrations have run (if initialisation fails they are
+# discarded with an error log).
+#
+# Initialisation is guarded so it runs once per process even if several code
+# paths ask for it.  Forked workers (``gunicorn --preload``) must not share the
+# parent's pooled sockets; ``db`` re-opens its pool in each child via an
+# ``os.register_at_fork`` hook, while the schema migrated by the parent stays
+# valid.  A parent that forks while the db-init thread is still running hands
+# the child neither that thread nor a usable pool, so the child starts its own
+# initialisation on its first ingest request.
+
+_db_init_lock = threading.Lock()
+_db_init_done = False
+
+
+def _ensure_db() -> None:
+    """Initialise the database at most once per process."""
+
+    global _db_init_done
+
+    with _db_init_lock:
+        if _db_init_done:
+            return
+        try:
+            init_db()
+        except RuntimeError as exc:  # Missing DB_URL → operate without persistence
+            logger.warning("Database not initialised (no DB_URL): %s", exc)
+        except Exception as exc:  # pragma: no cover – log but keep container alive
+            logger.exception("Database initialisation failed – continuing without DB: %s", exc)
+        _db_init_done = True
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
 
-load_dotenv()
+def _start_db_init() -> None:
+    """Open the insert buffer, then connect and migrate on a background thread."""
 
-# ---------------------------------------------------------------------------
-# Flask & Socket.IO setup
-# ---------------------------------------------------------------------------
+    try:
+        init_db_buffer()
+    except RuntimeError:
+        pass  # no DB_URL – reported by _ensure_db
+    threading.Thread(target=_ensure_db, name="db-init", daemon=True).start()
 
 
-app = Flask(__name__)
+_db_init_pending = False
 
-# Configure base path for subdirectory deployment (e.g., drose.io/collector)
-APPLICATION_ROOT = os.environ.get("APPLICATION_ROOT", "/")
-app.config["APPLICATION_ROOT"] = APPLICATION_ROOT
 
+def _db_after_fork() -> None:
+    """Forget a db-init thread that did not survive ``fork()``."""
 
-# Middleware to handle subdirectory routing - adds SCRIPT_NAME to WSGI environ
-# so url_for() generates URLs with the correct prefix
-class PrefixMiddleware:
-    def __init__(self, app, prefix=""):
-        self.app = app
-        self.prefix = prefix.rstrip("/")
+    global _db_init_lock, _db_init_pending
 
-    def __call__(self, environ, start_response):
-        if self.prefix:
-            environ["SCRIPT_NAME"] = self.prefix
-        return self.app(environ, start_response)
+    if not _db_init_done:
+        # The lock may have been held by the vanished thread.
+        _db_init_lock = threading.Lock()
+        _db_init_pending = True
 
 
-if APPLICATION_ROOT != "/":
-    app.wsgi_app = PrefixMiddleware(app.wsgi_app, prefix=APPLICATION_ROOT)
+def _resume_db_init() -> None:
+    """Restart an initialisation interrupted by ``fork()`` (no-op otherwise)."""
 
-# Thread-based async mode works out-of-the-box (no eventlet/gevent needed)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
+    global _db_init_pending
 
-# ---------------------------------------------------------------------------
-# Database initialisation (runs during application import)
-# ---------------------------------------------------------------------------
+    if _db_init_pending:
+        _db_init_pending = False
+        _start_db_init()
 
-# When the application is executed under Gunicorn (the recommended production
-# path defined in the Dockerfile) the ``main()`` helper is *not* invoked.  In
-# that code path the database connection pool must therefore be initialised
-# here at import-time so that routes – and, crucially, the ``/health``
-# endpoint used by Docker health-checks – can access it.  If the environment
-# is deliberately configured without a database (e.g. local UI-only preview
-# or CI unit tests) we fall back gracefully and keep the application running
-# with persistence disabled.
 
-try:
-    init_db()
-except RuntimeError as exc:  # Missing DB_URL → operate without persistence
-    logger.warning("Database not initialised (no DB_URL): %s", exc)
-except Exception as exc:  # pragma: no cover – log but keep container alive
-    logger.exception("Database initialisation failed – continuing without DB: %s", exc)
+_start_db_init()
+os.register_at_fork(after_in_child=_db_after_fork)
 
 # ---------------------------------------------------------------------------
 # WebSocket events
@@ -214,10 +252,69 @@ def _latency_check(ts):  # type: ignore[valid-type]
     return ts
 
 
+# Dashboard broadcasts are handed to a single background task so request
+# handlers never wait on Socket.IO serialisation or per-client sends.  Live
+# updates are lossy by nature: when the queue is full the update is dropped.
+# The loop drains up to _EMIT_BATCH updates at a time and yields to the event
+# loop between batches so a burst cannot starve the request greenlets.
+_EMIT_Q_MAXSIZE = 1000
+_EMIT_Q: queue.Queue[tuple[str, Any]] = queue.Queue(maxsize=_EMIT_Q_MAXSIZE)
+_EMIT_BATCH = 50
+_emit_put = _EMIT_Q.put_nowait
+
+
+def _emit_loop() -> None:
+    """Drain ``_EMIT_Q`` forever, broadcasting queued events in batches."""
+
+    get = _EMIT_Q.get
+    get_nowait = _EMIT_Q.get_nowait
+    emit = _emit
+    sleep = socketio.sleep
+    while True:
+        batch = [get()]
+        try:
+            while len(batch) < _EMIT_BATCH:
+                batch.append(get_nowait())
+        except queue.Empty:
+            pass
+
+        for event, data in batch:
+            try:
+                emit(event, data)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.exception("Socket.IO emit of %s failed: %s", event, exc)
+        sleep(0)
+
+
+# Background tasks do not survive ``fork()``: a pre-forked worker gets a fresh
+# queue (the old one's lock may have been held by the vanished loop) and
+# restarts the loop on its first broadcast.
+_emit_loop_running = False
+
+
 def _socket_emit(event: str, data) -> None:  # noqa: D401 – thin wrapper
-    """Emit *event* with *data* through the singleton Socket.IO instance."""
+    """Queue *event* with *data* for broadcast through the singleton Socket.IO instance."""
+
+    global _emit_loop_running
 
-    socketio.emit(event, data)
+    if not _emit_loop_running:
+        _emit_loop_running = True
+        socketio.start_background_task(_emit_loop)
+    try:
+        _emit_put((event, data))
+    except queue.Full:
+        pass
+
+
+def _emit_after_fork() -> None:
+    global _EMIT_Q, _emit_put, _emit_loop_running
+
+    _EMIT_Q = queue.Queue(maxsize=_EMIT_Q_MAXSIZE)
+    _emit_put = _EMIT_Q.put_nowait
+    _emit_loop_running = False
+
+
+os.register_at_fork(after_in_child=_emit_after_fork)
 
 
 # ---------------------------------------------------------------------------
@@ -225,42 +322,95 @@ def _socket_emit(event: str, data) -> None:  # noqa: D401 – thin wrapper
 # ---------------------------------------------------------------------------
 
 
+def _json_response(obj: Any, status: int = 200):
+    """Serialise *obj* with orjson and wrap it in a JSON response."""
+
+    return app.response_class(orjson.dumps(obj), status=status, mimetype="application/json")
+
+
+# Constant replies on the hot paths are encoded once and the same response
+# object is returned every time; dynamic bodies still go via _json_response.
+_OK = _json_response({"status": "ok"}, 200)
+_TOO_LARGE = _json_response({"message": "Payload too large"}, 413)
+_BAD_JSON = _json_response({"message": "Invalid JSON"}, 400)
+
+
+# Proxy headers in order of preference, as WSGI environ keys – reading the
+# environ directly skips Werkzeug's case-insensitive header lookup.
+_CLIENT_IP_ENVIRON_KEYS = ("HTTP_CF_CONNECTING_IP", "HTTP_X_REAL_IP", "HTTP_X_FORWARDED_FOR")
+
+
 def get_client_ip() -> str:
     """Extract real client IP, respecting proxy headers.
 
     Checks common proxy headers in order of preference and falls back to
     the direct connection address if no proxy headers are present.
     """
-    # Check common proxy headers in order of preference
-    for header in ("CF-Connecting-IP", "X-Real-IP", "X-Forwarded-For"):
-        if ip := request.headers.get(header):
+    environ = request.environ
+    for key in _CLIENT_IP_ENVIRON_KEYS:
+        if ip := environ.get(key):
             # X-Forwarded-For can be comma-separated; take first
-            return ip.split(",")[0].strip()
+            return ip.partition(",")[0].strip()
     return request.remote_addr or ""
 
 
-def _events_enabled() -> bool:
-    """Return whether client/server event stream is enabled.
+@functools.lru_cache(maxsize=4096)
+def _compute_ip_hash(ip: str) -> str | None:
+    """Return the salted SHA-256 of *ip*, or ``None`` when hashing is disabled.
 
-    Missing env defaults to enabled (prod-friendly), explicit false disables.
+    The salt is fixed for the process lifetime, so repeat visitors are served
+    from the LRU cache without re-hashing.  Valid addresses are hashed in
+    their packed 4/16-byte form so equivalent spellings of the same IPv6
+    address map to one digest; anything unparsable falls back to its text.
     """
 
-    val = os.getenv("COLLECTOR_EVENTS_ENABLED")
-    if val is None:
-        return True
-    return val.strip().lower() in {"1", "true", "t", "yes", "y", "on"}
+    if not _IP_HASH_SALT or not ip:
+        return None
+    try:
+        packed = ipaddress.ip_address(ip).packed
+    except ValueError:
+        packed = ip.encode("utf-8")
+    return hashlib.sha256(packed + b"\x00" + _IP_HASH_SALT).hexdigest()
 
 
-def _compute_ip_hash(*, ip: str, salt: str | None) -> str | None:
-    if not salt:
-        return None
-    if not ip:
-        return None
-    h = hashlib.sha256()
-    h.update(ip.encode("utf-8"))
-    h.update(b"\x00")
-    h.update(salt.encode("utf-8"))
-    return h.hexdigest()
+def _read_capped(stream, limit: int) -> bytes:
+    """Read from *stream* until EOF or ``limit + 1`` bytes, whichever is first."""
+
+    chunks: list[bytes] = []
+    remaining = limit + 1
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+# /event schema – compiled once into straight-line Python by fastjsonschema.
+# Identifier fields must be present and truthy; ``seq`` is an optional int
+# that must fit ``collector_events.seq`` (PostgreSQL INTEGER).
+_EVENT_REQUIRED = ("visitor_id", "session_id", "pageview_id", "event_type")
+_NON_EMPTY = {"not": {"enum": [None, "", 0, False, [], {}]}}
+_EVENT_SCHEMA = {
+    "type": "object",
+    "required": list(_EVENT_REQUIRED),
+    "properties": {
+        **{key: _NON_EMPTY for key in _EVENT_REQUIRED},
+        "seq": {"type": ["integer", "null"], "minimum": -(2**31), "maximum": 2**31 - 1},
+    },
+}
+_validate_event = fastjsonschema.compile(_EVENT_SCHEMA)
+
+
+# Shared read-only fallback for absent nested payload sections; never mutated.
+_EMPTY: Dict[str, Any] = {}
+
+
+def _delta(end: float | None, start: float) -> float | None:
+    """Return ``end - start`` when the *end* timestamp is set, else ``None``."""
+
+    return end - start if end else None
 
 
 # ---------------------------------------------------------------------------
@@ -272,13 +422,13 @@ def _compute_ip_hash(*, ip: str, salt: str | None) -> str | None:
 def index():  # noqa: D401 – Flask view
     return render_template(
         "index.html",
-        collector_events_enabled=_events_enabled(),
+        collector_events_enabled=_EVENTS_ENABLED,
         application_root=APPLICATION_ROOT,
     )
 
 
 @app.route("/event", methods=["POST"])
-def event() -> tuple[dict[str, Any], int]:  # noqa: D401 – Flask view
+def event():  # noqa: D401 – Flask view
     """Receive a single event payload and append to collector_events.
 
     Rejects request bodies larger than 256KB.
@@ -287,124 +437,272 @@ def event() -> tuple[dict[str, Any], int]:  # noqa: D401 – Flask view
     max_bytes = 256 * 1024
     raw_len = request.content_length
     if raw_len is not None and raw_len > max_bytes:
-        return jsonify({"message": "Payload too large"}), 413
-
-    # If Content-Length is absent, enforce cap by reading bytes first.
-    raw_body: bytes | None = None
-    if raw_len is None:
-        try:
-            raw_body = request.get_data(cache=False) or b""
-        except Exception:
-            return jsonify({"message": "Payload too large"}), 413
-        if len(raw_body) > max_bytes:
-            return jsonify({"message": "Payload too large"}), 413
+        return _TOO_LARGE
 
+    # Content-Length is checked above; bodies without the header (chunked
+    # uploads) are read at most one byte past the cap so an oversized payload
+    # is never fully buffered.
     try:
-        if raw_body is not None:
-            data = json.loads(raw_body.decode("utf-8") or "{}")
-        else:
-            data = request.get_json(force=True) or {}
-        if not isinstance(data, dict):
-            return jsonify({"message": "Invalid JSON"}), 400
+        raw_body = _read_capped(request.stream, max_bytes)
     except Exception:
-        return jsonify({"message": "Invalid JSON"}), 400
+        return _TOO_LARGE
+    if len(raw_body) > max_bytes:
+        return _TOO_LARGE
 
-    required = ("visitor_id", "session_id", "pageview_id", "event_type")
-    missing = [k for k in required if not data.get(k)]
-    if missing:
-        return jsonify({"message": "Missing required fields", "missing": missing}), 400
+    # orjson parses bytes directly – no intermediate UTF-8 decode needed.
+    try:
+        data = orjson.loads(raw_body or b"{}")
+    except orjson.JSONDecodeError:
+        return _BAD_JSON
+    if not isinstance(data, dict):
+        return _BAD_JSON
 
-    seq_val = data.get("seq", 0)
+    try:
+        _validate_event(data)
+    except fastjsonschema.JsonSchemaValueException as exc:
+        missing = [k for k in _EVENT_REQUIRED if not data.get(k)]
+        if missing:
+            return _json_response({"message": "Missing required fields", "missing": missing}, 400)
+        if exc.name == "data.seq":
+            if exc.rule in ("minimum", "maximum"):
+                return _json_response({"message": "seq out of range"}, 400)
+            return _json_response({"message": "seq must be an integer"}, 400)
+        return _json_response({"message": exc.message}, 400)
+
+    # JSON Schema counts 1.0 as an integer; the API only accepts real ints.
+    seq_val = data.get("seq")
     if seq_val is None:
         seq_val = 0
-    if isinstance(seq_val, bool) or not isinstance(seq_val, int):
-        return jsonify({"message": "seq must be an integer"}), 400
+    elif isinstance(seq_val, bool) or not isinstance(seq_val, int):
+        return _json_response({"message": "seq must be an integer"}, 400)
 
     ip = get_client_ip()
-    salt = os.getenv("EVENT_IP_HASH_SALT")
-    ip_hash = _compute_ip_hash(ip=ip, salt=salt)
-
-    insert_event(
-        client_timestamp=data.get("client_timestamp"),
-        visitor_id=str(data["visitor_id"]),
-        session_id=str(data["session_id"]),
-        pageview_id=str(data["pageview_id"]),
-        event_type=str(data["event_type"]),
-        seq=seq_val,
-        path=data.get("path"),
-        referrer=data.get("referrer"),
-        ip_hash=ip_hash,
-        user_agent=request.headers.get("User-Agent"),
-        payload=data.get("payload") if isinstance(data.get("payload"), dict) else {},
-    )
+    ip_hash = _compute_ip_hash(ip)
 
-    return jsonify({"status": "ok"}), 200
+    _resume_db_init()
+    try:
+        insert_event(
+            client_timestamp=data.get("client_timestamp"),
+            visitor_id=str(data["visitor_id"]),
+            session_id=str(data["session_id"]),
+            pageview_id=str(data["pageview_id"]),
+            event_type=str(data["event_type"]),
+            seq=seq_val,
+            path=data.get("path"),
+            referrer=data.get("referrer"),
+            ip_hash=ip_hash,
+            user_agent=request.headers.get("User-Agent"),
+            payload=data.get("payload") if isinstance(data.get("payload"), dict) else {},
+        )
+    except queue.Full:
+        # Insert buffer saturated – ask the client to retry later.
+        return _json_response({"message": "Server busy"}, 503)
 
+    return _OK
 
-@app.route("/collect", methods=["POST"])
-def collect() -> tuple[dict[str, Any], int]:  # noqa: D401 – Flask view
-    """Receive JSON payload from client, store it and fan-out to WebSocket."""
 
+def _record_fields(data: Dict[str, Any], ip: str) -> Dict[str, Any]:
+    """Map one /collect payload onto the ``insert_debug_record`` keywords."""
+
+    return {
+        "ip": ip,
+        "browser_info": data.get("browser", {}),
+        "performance_data": data.get("performance") or _EMPTY,
+        "fingerprints": data.get("fingerprints", {}),
+        "errors": data.get("errors") or [],
+        "network": data.get("network"),
+        "battery": data.get("battery"),
+        "benchmarks": data.get("benchmarks"),
+        "client_timestamp": data.get("timestamp"),
+        "visitor_id": data.get("visitor_id"),
+        "session_id": data.get("session_id"),
+        "pageview_id": data.get("pageview_id"),
+    }
+
+
+def _dashboard_update(data: Dict[str, Any]) -> Dict[str, Any] | None:
+    """Build the lightweight ``new_payload`` dashboard update for *data*.
+
+    Returns ``None`` when there is nothing to show.  Each timing key is looked
+    up once; navigation timing uses 0 for "did not happen".
+    """
+
+    performance = data.get("performance") or _EMPTY
+    errors = data.get("errors") or []
+    vitals = performance.get("webVitals") or _EMPTY
+    timing = performance.get("timing") or _EMPTY
+    if not (vitals or timing or errors):
+        return None
+
+    nav = timing.get("navigationStart", 0)
+    rs = timing.get("responseStart")
+    re_ = timing.get("responseEnd")
+    dls = timing.get("domainLookupStart")
+    dle = timing.get("domainLookupEnd")
+    cs = timing.get("connectStart")
+    ce = timing.get("connectEnd")
+    dcl = timing.get("domContentLoadedEventEnd")
+    le = timing.get("loadEventEnd")
+
+    return {
+        "timestamp": data.get("timestamp"),
+        "lcp": vitals.get("LCP"),
+        "fcp": vitals.get("FCP"),
+        "fid": vitals.get("FID"),
+        "cls": vitals.get("CLS"),
+        "ttfb": _delta(rs, nav),
+        "dnsTime": _delta(dle, dls) if dls else None,
+        "connectTime": _delta(ce, cs) if cs else None,
+        "responseTime": _delta(re_, rs) if rs else None,
+        "domReady": _delta(dcl, nav),
+        "loadComplete": _delta(le, nav),
+        "errorCount": len(errors),
+    }
+
+
+def _collect_record(data: Dict[str, Any], ip: str) -> None:
+    """Queue one debug record for storage and fan it out to dashboards."""
+
+    # The update is built first so a payload that cannot be summarised fails
+    # before anything is queued.
+    update = _dashboard_update(data)
+    insert_debug_record(**_record_fields(data, ip))
+    if update is not None:
+        _socket_emit("new_payload", update)
+
+
+# Upper bounds on one application/x-ndjson /collect body.
+_NDJSON_MAX_RECORDS = 1000
+_NDJSON_MAX_BYTES = 16 * 1024 * 1024
+
+
+def _collect_ndjson():
+    """Handle a newline-delimited batch of /collect records.
+
+    The batch is all-or-nothing: the body size and record count are checked
+    before parsing, every line is parsed and summarised before anything is
+    queued, and the records are queued in one step – a full insert buffer
+    rejects the whole batch with 503, so a client retry never duplicates.
+    """
+
+    raw_len = request.content_length
+    if raw_len is not None and raw_len > _NDJSON_MAX_BYTES:
+        return _TOO_LARGE
+    raw_body = _read_capped(request.stream, _NDJSON_MAX_BYTES)
+    if len(raw_body) > _NDJSON_MAX_BYTES:
+        return _TOO_LARGE
+
+    lines = [line for line in raw_body.splitlines() if line.strip()]
+    if len(lines) > _NDJSON_MAX_RECORDS:
+        return _TOO_LARGE
     try:
-        data: Dict[str, Any] = request.get_json(force=True) or {}
-
-        insert_debug_record(
-            ip=get_client_ip(),
-            browser_info=data.get("browser", {}),
-            performance_data=data.get("performance", {}),
-            fingerprints=data.get("fingerprints", {}),
-            errors=data.get("errors", []),
-            network=data.get("network"),
-            battery=data.get("battery"),
-            benchmarks=data.get("benchmarks"),
-            client_timestamp=data.get("timestamp"),
-            visitor_id=data.get("visitor_id"),
-            session_id=data.get("session_id"),
-            pageview_id=data.get("pageview_id"),
-        )
+        records = [orjson.loads(line) for line in lines]
+    except orjson.JSONDecodeError:
+        return _BAD_JSON
+    if not all(isinstance(record, dict) for record in records):
+        return _BAD_JSON
 
-        # Push a lightweight update to real-time dashboards.
-        vitals = data.get("performance", {}).get("webVitals", {})
-        timing = data.get("performance", {}).get("timing", {})
-
-        _socket_emit(
-            "new_payload",
-            {
-                "timestamp": data.get("timestamp"),
-                "lcp": vitals.get("LCP"),
-                "fcp": vitals.get("FCP"),
-                "fid": vitals.get("FID"),
-                "cls": vitals.get("CLS"),
-                "ttfb": timing.get("responseStart") - timing.get("navigationStart", 0)
-                if timing.get("responseStart")
-                else None,
-                "dnsTime": timing.get("domainLookupEnd") - timing.get("domainLookupStart", 0)
-                if timing.get("domainLookupEnd") and timing.get("domainLookupStart")
-                else None,
-                "connectTime": timing.get("connectEnd") - timing.get("connectStart", 0)
-                if timing.get("connectEnd") and timing.get("connectStart")
-                else None,
-                "responseTime": timing.get("responseEnd") - timing.get("responseStart", 0)
-                if timing.get("responseEnd") and timing.get("responseStart")
-                else None,
-                "domReady": timing.get("domContentLoadedEventEnd") - timing.get("navigationStart", 0)
-                if timing.get("domContentLoadedEventEnd")
-                else None,
-                "loadComplete": timing.get("loadEventEnd") - timing.get("navigationStart", 0)
-                if timing.get("loadEventEnd")
-                else None,
-                "errorCount": len(data.get("errors", [])),
-            },
-        )
+    ip = get_client_ip()
+    updates = [_dashboard_update(record) for record in records]
+    insert_debug_records([_record_fields(record, ip) for record in records])
+    for update in updates:
+        if update is not None:
+            _socket_emit("new_payload", update)
+    return _json_response({"status": "accepted", "count": len(records)}, 202)
+
+
+@app.route("/collect", methods=["POST"])
+def collect():  # noqa: D401 – Flask view
+    """Receive JSON payload from client, store it and fan-out to WebSocket.
 
-        return jsonify({"status": "ok"}), 200
+    ``application/x-ndjson`` bodies carry one record per line and are queued
+    as a batch (HTTP 202 with the record count).
+    """
+
+    _resume_db_init()
+    try:
+        if request.mimetype == "application/x-ndjson":
+            return _collect_ndjson()
+
+        data: Dict[str, Any] = orjson.loads(request.get_data(cache=False) or b"{}") or {}
+        _collect_record(data, get_client_ip())
+        return _OK
+    except queue.Full:
+        # Insert buffer saturated – ask the client to retry later.
+        return _json_response({"message": "Server busy"}, 503)
     except Exception as exc:  # pylint: disable=broad-except
         logger.exception("Error while handling /collect: %s", exc)
-        return jsonify({"message": "Internal Server Error"}), 500
+        return _json_response({"message": "Internal Server Error"}, 500)
+
+
+# /health answers from the result of the last background probe instead of
+# checking out a pool connection per request, so orchestrator probes never
+# queue behind /collect for a connection, and a slow database cannot make
+# the health check itself slow.
+_HEALTH_INTERVAL = 2.0
+_HEALTH_STALE_AFTER = 10.0
+_HEALTHY_CONNECTED = _json_response({"status": "healthy", "database": "connected"}, 200)
+_HEALTHY_NOT_CONFIGURED = _json_response({"status": "healthy", "database": "not_configured"}, 200)
+_HEALTH_STALE = _json_response({"status": "unhealthy", "database": "health probe stalled"}, 503)
+_health_state: tuple[float, Any] = (0.0, None)
+
+
+def _probe_db() -> None:
+    """Run ``SELECT 1`` against the pool and cache the matching response."""
+
+    global _health_state
+
+    try:
+        with get_conn() as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+        resp = _HEALTHY_CONNECTED
+    except RuntimeError:
+        # Pool not initialised – most likely because ``DB_URL`` is unset.  We
+        # treat this as *healthy* so that stateless deployments remain
+        # functional.
+        resp = _HEALTHY_NOT_CONFIGURED
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.error("Health check failed: %s", exc)
+        resp = _json_response({"status": "unhealthy", "database": str(exc)}, 503)
+    _health_state = (time.monotonic(), resp)
+
+
+def _health_loop() -> None:
+    """Refresh the cached health result every ``_HEALTH_INTERVAL`` seconds."""
+
+    while True:
+        _probe_db()
+        socketio.sleep(_HEALTH_INTERVAL)
+
+
+# Background tasks do not survive ``fork()``: a pre-forked worker restarts the
+# loop on its first /health request instead of reporting a stalled probe.
+_health_loop_running = False
+
+
+def _ensure_health_loop() -> None:
+    """Start ``_health_loop`` unless it already runs in this process."""
+
+    global _health_loop_running
+
+    if not _health_loop_running:
+        _health_loop_running = True
+        socketio.start_background_task(_health_loop)
+
+
+def _health_after_fork() -> None:
+    global _health_loop_running
+
+    _health_loop_running = False
+
+
+_ensure_health_loop()
+os.register_at_fork(after_in_child=_health_after_fork)
 
 
 @app.route("/health")
-def health() -> tuple[dict[str, str], int]:  # noqa: D401 – Flask view
+def health():  # noqa: D401 – Flask view
     """Readiness probe for container orchestrators.
 
     Behaviour matrix:
@@ -412,54 +710,102 @@ def health() -> tuple[dict[str, str], int]:  # noqa: D401 – Flask view
     • DB available and reachable   → HTTP 200 {healthy, connected}
     • DB intentionally disabled    → HTTP 200 {healthy, not_configured}
     • DB configured but unreachable→ HTTP 503 {unhealthy, <error>}
+    • No probe finished for 10 s   → HTTP 503 {unhealthy, health probe stalled}
     """
 
+    _ensure_health_loop()
+    checked_at, resp = _health_state
+    if not checked_at:
+        # First request raced the background task – probe inline once.
+        _probe_db()
+        checked_at, resp = _health_state
+    if time.monotonic() - checked_at > _HEALTH_STALE_AFTER:
+        return _HEALTH_STALE
+    return resp
+
+
+@app.route("/metrics")
+def metrics():  # noqa: D401 – Flask view
+    """Expose connection-pool and insert-buffer saturation as JSON."""
+
     try:
-        # If the connection pool is initialised, perform a cheap connection
-        # round-trip; otherwise assume DB persistence is intentionally
-        # disabled (e.g. preview deployments) and still report healthy so the
-        # container does not flap.
-        with get_conn():
-            pass
-        return jsonify({"status": "healthy", "database": "connected"}), 200
+        return _json_response({"database": "connected", **pool_stats()})
     except RuntimeError:
-        # Pool not initialised – most likely because ``DB_URL`` is unset.  We
-        # treat this as *healthy* so that stateless deployments remain
-        # functional.
-        return jsonify({"status": "healthy", "database": "not_configured"}), 200
-    except Exception as exc:  # pylint: disable=broad-except
-        logger.error("Health check failed: %s", exc)
-        return jsonify({"status": "unhealthy", "database": str(exc)}), 503
+        return _json_response({"database": "not_configured"})
 
 
 # ---------------------------------------------------------------------------
 # Lightweight endpoints for client-side network testing
 # ---------------------------------------------------------------------------
 
+# ``/bw`` streams pieces of one random, incompressible blob generated at
+# import: per-request work is a list slice, and transparent compression
+# anywhere on the path can neither shrink the body nor skew the measured
+# throughput.  Every full 64 KB piece is a pre-built bytes object, so only the
+# final partial piece is ever allocated.
+_BW_MAX_BYTES = 5_000_000  # cap at 5 MB safety
+_BW_DEFAULT_BYTES = 500_000  # default ≈ 0.5 MB
+_BW_MAX_DIGITS = len(str(_BW_MAX_BYTES))
+_BW_CHUNK_SIZE = 64 * 1024
+_BW_CHUNKS = [os.urandom(min(_BW_CHUNK_SIZE, _BW_MAX_BYTES - off)) for off in range(0, _BW_MAX_BYTES, _BW_CHUNK_SIZE)]
+_BW_HEADERS = {"Content-Encoding": "identity", "Cache-Control": "no-store"}
+
+
+def _bw_chunks(size: int):
+    """Yield the first *size* bytes of the blob in ``_BW_CHUNK_SIZE`` pieces."""
+
+    full, rest = divmod(size, _BW_CHUNK_SIZE)
+    yield from _BW_CHUNKS[:full]
+    if rest:
+        yield _BW_CHUNKS[full][:rest]
+
+
+# The /ping body never changes, so one pre-built response is shared by every
+# request – the RTT probe measures the network, not JSON serialisation.
+_PING_BODY = b'{"ok":true}'
+_PING_RESP = app.response_class(
+    _PING_BODY,
+    status=200,
+    mimetype="application/json",
+    headers={"Cache-Control": "no-store"},
+)
+
 
 @app.route("/ping")
 def ping():  # noqa: D401 – simple latency probe
     """Return a minimal JSON payload quickly for RTT measurement."""
 
-    return jsonify({"ok": True})
+    return _PING_RESP
 
 
 @app.route("/bw")
 def bandwidth():  # noqa: D401 – simple bandwidth test payload
     """Serve a blob of a requested size (bytes) for bandwidth estimation.
 
-    Client requests `/bw?bytes=500000` → server sends *bytes* repeated "x".
-    The response is intentionally uncompressed (text/plain) so size on the
-    wire is deterministic.
+    Client requests `/bw?bytes=500000` → server sends *bytes* random bytes.
+    The response is explicitly uncompressed (``Content-Encoding: identity``),
+    uncached and carries a fixed ``Content-Length`` so the size on the wire is
+    deterministic and no middleware spends CPU re-encoding it.
     """
 
-    try:
-        size = int(request.args.get("bytes", 500_000))  # default ≈ 0.5 MB
-        size = max(0, min(size, 5_000_000))  # cap at 5 MB safety
-    except (TypeError, ValueError):
-        size = 500_000
-
-    return ("x" * size, 200, {"Content-Type": "text/plain"})
+    # Only plain ASCII digit strings are parsed; anything else (including
+    # negatives) falls back to the default.  Longer strings than the cap has
+    # digits are clamped without converting – int() rejects huge ones.
+    raw = request.args.get("bytes", "")
+    if not (raw.isascii() and raw.isdigit()):
+        size = _BW_DEFAULT_BYTES
+    elif len(raw) > _BW_MAX_DIGITS:
+        size = _BW_MAX_BYTES
+    else:
+        size = min(int(raw), _BW_MAX_BYTES)
+
+    return app.response_class(
+        _bw_chunks(size),
+        status=200,
+        mimetype="application/octet-stream",
+        headers={**_BW_HEADERS, "Content-Length": str(size)},
+        direct_passthrough=True,
+    )
 
 
 @app.route("/v1/context.min.js")
@@ -486,7 +832,7 @@ def context_library():  # noqa: D401 – serve visitor context library
     lib_path = production_path if production_path.exists() else dev_path
 
     if not lib_path.exists():
-        return jsonify({"message": "Library not found"}), 404
+        return _json_response({"message": "Library not found"}, 404)
 
     # Read file and compute ETag
     content = lib_path.read_bytes()
@@ -527,7 +873,7 @@ def main() -> None:  # pragma: no cover – executed only as script
     args = parser.parse_args()
 
     if not args.skip_db:
-        init_db()
+        _ensure_db()
 
     # -------------------------------------------------------------------
     # Dynamic port selection
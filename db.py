@@ -6,33 +6,200 @@ created on startup and a context-manager wrapper exposes pooled connections.
 
 All payload columns are stored as native JSONB, which makes future querying of
 individual keys efficient and type-safe.
+
+Inserts are buffered: the public ``insert_*`` helpers only enqueue a row and a
+background flusher thread coalesces queued rows into multi-row ``INSERT``
+statements, so request handlers never wait on a database round-trip.
 """
 
 from __future__ import annotations
 
+import atexit
+import datetime as dt
+import hashlib
+import io
 import logging
 import os
+import queue
+import threading
+import time
 from contextlib import contextmanager
 from typing import Generator
 
+import orjson
 import psycopg2
+from psycopg2.extensions import get_wait_callback
+from psycopg2.extensions import parse_dsn
 from psycopg2.extras import Json
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.extras import execute_values
+from psycopg2.pool import ThreadedConnectionPool
 
 # Application-wide logger.
 logger = logging.getLogger(__name__)
 
+# Insert buffering – rows are flushed once ``_BATCH_MAX_ROWS`` are queued or
+# ``_BATCH_FLUSH_INTERVAL`` seconds after the first row of a batch arrived,
+# whichever comes first.  A full queue raises ``queue.Full`` to the caller so
+# the HTTP layer can apply backpressure.
+_QUEUE_MAXSIZE = 50_000
+_BATCH_MAX_ROWS = 1000
+_BATCH_FLUSH_INTERVAL = 0.2
+
+# Pool sizing follows the usual ``cores * 2 + 1`` rule of thumb; ``DB_POOL_MAX``
+# overrides the upper bound.
+_POOL_MIN = 2
+
+
+def _default_pool_max() -> int:
+    return (os.cpu_count() or 1) * 2 + 1
+
+
+# TCP keepalives let long-lived pooled connections notice a dead peer (NAT or
+# load-balancer idle drops) instead of hanging the next query; libpq already
+# sets TCP_NODELAY itself.  Values given explicitly in ``DB_URL`` win.
+_CONN_DEFAULTS = {"keepalives": "1", "keepalives_idle": "30", "keepalives_interval": "10", "keepalives_count": "3"}
+
+
+# Batches of at least ``_COPY_MIN_ROWS`` rows for one table are streamed with
+# ``COPY … FROM STDIN``, which skips parsing one huge ``VALUES`` list; smaller
+# batches use a multi-row ``INSERT``.  psycopg2 refuses COPY while a wait
+# callback is registered (psycogreen under gevent), so then every batch takes
+# the ``INSERT`` path.
+_COPY_MIN_ROWS = 500
+
+_TABLE_COLUMNS = {
+    "debug_data": (
+        "ip",
+        "browser_info",
+        "performance_data",
+        "fingerprints",
+        "errors",
+        "network",
+        "battery",
+        "benchmarks",
+        "client_timestamp",
+        "visitor_id",
+        "session_id",
+        "pageview_id",
+        "fingerprint_hash",
+    ),
+    "fingerprint_dict": ("hash", "body"),
+    "collector_events": (
+        "client_timestamp",
+        "visitor_id",
+        "session_id",
+        "pageview_id",
+        "event_type",
+        "seq",
+        "path",
+        "referrer",
+        "ip_hash",
+        "user_agent",
+        "payload",
+    ),
+}
+# Dictionary tables only ever gain new keys: they are written with
+# ``ON CONFLICT DO NOTHING`` and therefore never via COPY.
+_DICT_TABLES = frozenset({"fingerprint_dict"})
+
+_BATCH_INSERT_SQL = {
+    table: f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s"
+    + (" ON CONFLICT DO NOTHING" if table in _DICT_TABLES else "")
+    for table, columns in _TABLE_COLUMNS.items()
+}
+_BATCH_COPY_SQL = {
+    table: f"COPY {table} ({', '.join(columns)}) FROM STDIN" for table, columns in _TABLE_COLUMNS.items()
+}
+
+# Characters that must be backslash-escaped in COPY's text format.
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\n": "\\n", "\r": "\\r", "\t": "\\t"})
+
+
+def _copy_field(value) -> str:
+    """Render one column value in PostgreSQL's COPY text format."""
+
+    if value is None:
+        return "\\N"
+    if isinstance(value, Json):
+        value = value.dumps(value.adapted)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+# Range of PostgreSQL's INTEGER (``collector_events.seq``).
+_INT4_MIN, _INT4_MAX = -(2**31), 2**31 - 1
+
+# Errors caused by the contents of a row rather than by the connection or the
+# schema.  A batch failing with one of these is retried row by row (see
+# ``_Database._write_rows_isolated``) so only the offending rows are lost.
+# ``ValueError`` covers values psycopg2 refuses to send, e.g. NUL characters.
+_ROW_ERRORS = (psycopg2.DataError, psycopg2.IntegrityError, ValueError)
+
+
+def _timestamptz(value) -> dt.datetime | None:
+    """Parse a client-supplied ISO-8601 timestamp, or return ``None``.
+
+    Client clocks and payloads are untrusted: anything PostgreSQL might reject
+    is stored as NULL instead of failing the batch it is flushed with.
+    """
+
+    if not isinstance(value, str):
+        return None
+    try:
+        return dt.datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def _text(value) -> str | None:
+    """Return *value* as a string for a TEXT column, keeping ``None``."""
+
+    return value if value is None or isinstance(value, str) else str(value)
+
+
+def _fingerprint_key(fingerprints: dict) -> tuple[int, str]:
+    """Return ``(hash, canonical JSON)`` for a fingerprint blob.
+
+    Keys are sorted so equal blobs always encode – and hash – identically.
+    The hash is a signed 64-bit BLAKE2b digest to fit a ``BIGINT`` column.
+    """
+
+    body = orjson.dumps(fingerprints, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    digest = hashlib.blake2b(body, digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True), body.decode("utf-8")
+
+
+class _OrjsonJson(Json):
+    """``Json`` adapter that serialises JSONB parameters with orjson.
+
+    Payloads reach this module already decoded by orjson, so they always
+    re-encode cleanly; orjson also writes non-finite floats as ``null``
+    rather than the ``NaN`` tokens PostgreSQL rejects.
+    """
+
+    def dumps(self, obj):
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
 
 class _Database:
-    """Lightweight wrapper around a psycopg2 connection pool."""
+    """Lightweight wrapper around a thread-safe psycopg2 connection pool."""
 
     def __init__(self) -> None:
-        self._pool: SimpleConnectionPool | None = None
+        self._pool: ThreadedConnectionPool | None = None
+        self._pool_args: tuple[str, int, int] | None = None
+        # Pools inherited across fork() are kept referenced, never closed:
+        # closing would terminate sessions whose sockets the parent still owns.
+        self._inherited_pools: list[ThreadedConnectionPool] = []
+        self._queue: queue.Queue[tuple[str, tuple]] = queue.Queue(maxsize=_QUEUE_MAXSIZE)
+        self._flusher: threading.Thread | None = None
+        # Rows are accepted into the buffer as soon as a database is
+        # configured, but only written once the flusher is started after the
+        # migrations have run.
+        self._accepting = False
 
     # ---------------------------------------------------------------------
     # Pool management
     # ---------------------------------------------------------------------
-    def init_pool(self, dsn: str, *, minconn: int = 1, maxconn: int = 5) -> None:
+    def init_pool(self, dsn: str, *, minconn: int = _POOL_MIN, maxconn: int | None = None) -> None:
         """Initialise the global connection pool.
 
         Should be called once during application bootstrap. Subsequent calls
@@ -43,36 +210,99 @@ class _Database:
             logger.debug("Database pool already initialised – skipping.")
             return
 
-        logger.info("Initialising database connection pool …")
+        if maxconn is None:
+            maxconn = _default_pool_max()
+        minconn = min(minconn, maxconn)
+
+        logger.info("Initialising database connection pool (%d–%d connections) …", minconn, maxconn)
         try:
-            self._pool = SimpleConnectionPool(minconn, maxconn, dsn=dsn)
+            options = {key: value for key, value in _CONN_DEFAULTS.items() if key not in parse_dsn(dsn)}
+            self._pool = ThreadedConnectionPool(minconn, maxconn, dsn=dsn, **options)
         except psycopg2.Error as exc:
             logger.exception("Failed to establish database connection pool: %s", exc)
             raise
+        self._pool_args = (dsn, minconn, maxconn)
+
+    def start_flusher(self) -> None:
+        """Start writing buffered rows; call once the schema is up to date."""
+
+        if self._flusher is None:
+            self._flusher = threading.Thread(target=self._flush_loop, name="db-flusher", daemon=True)
+            self._flusher.start()
+
+    def _reinit_after_fork(self) -> None:
+        """Give a forked child its own pool, buffer and flusher thread.
+
+        Registered with ``os.register_at_fork``.  The child must not reuse the
+        parent's connections (both processes would talk over the same
+        sockets), nor its queued rows (they would be written twice).
+        """
+
+        initialised = self._flusher is not None
+        self._queue = queue.Queue(maxsize=_QUEUE_MAXSIZE)
+        self._flusher = None
+        if self._pool is not None:
+            self._inherited_pools.append(self._pool)
+            self._pool = None
+
+        if not initialised:
+            # The parent forked while ``init()`` was still connecting or
+            # migrating on a thread that does not exist here.  Refuse rows
+            # this process could never write until ``init()`` is re-run.
+            if self._accepting:
+                logger.warning("Forked during database initialisation – call init() again in this process.")
+            self._accepting = False
+            return
+
+        dsn, minconn, maxconn = self._pool_args
+        try:
+            self.init_pool(dsn, minconn=minconn, maxconn=maxconn)
+        except psycopg2.Error:
+            logger.warning("Continuing without database in forked worker.")
+            self._accepting = False
+            return
+        self.start_flusher()
 
     @property
-    def pool(self) -> SimpleConnectionPool:
+    def pool(self) -> ThreadedConnectionPool:
         if self._pool is None:
             raise RuntimeError("Database pool accessed before initialisation.")
         return self._pool
 
+    def pool_stats(self) -> dict[str, int]:
+        """Return a point-in-time snapshot of pool and insert-buffer usage.
+
+        Raises ``RuntimeError`` when the pool has not been initialised.
+        """
+
+        pool = self.pool
+        return {
+            "pool_min": pool.minconn,
+            "pool_max": pool.maxconn,
+            "pool_in_use": len(pool._used),
+            "pool_idle": len(pool._pool),
+            "insert_queue": self._queue.qsize(),
+        }
+
     # ------------------------------------------------------------------
     # High-level helpers
     # ------------------------------------------------------------------
     @contextmanager
     def get_conn(self) -> Generator[psycopg2.extensions.connection, None, None]:
-        """Yield a pooled connection, returning it afterwards."""
+        """Yield a pooled connection, returning it (or discarding it) afterwards."""
 
-        conn = self.pool.getconn()
+        pool = self.pool
+        conn = pool.getconn()
         try:
             yield conn
         finally:
-            self.pool.putconn(conn)
+            # Broken connections are discarded instead of handed out again.
+            pool.putconn(conn, close=bool(conn.closed))
 
     # ------------------------------------------------------------------
     # Schema helpers
     # ------------------------------------------------------------------
-    def init_schema(self) -> None:
+    def init_schema(self, dsn: str) -> None:
         """Run database migrations to ensure schema is up to date.
 
         The actual DDL is managed by SQL migration files in the migrations/
@@ -99,14 +329,46 @@ class _Database:
         from migrations import MigrationRunner
 
         migrations_dir = Path(__file__).parent / "migrations"
-        runner = MigrationRunner(os.getenv("DB_URL", ""), migrations_dir)
+        runner = MigrationRunner(dsn, migrations_dir)
         runner.run()
 
     # ------------------------------------------------------------------
     # Insert helpers
     # ------------------------------------------------------------------
-    def insert_debug_record(
-        self,
+    def insert_debug_record(self, **record) -> None:
+        """Queue a single record for batched insertion into *debug_data*.
+
+        Accepts the keyword arguments described in :meth:`insert_debug_records`.
+        Raises ``queue.Full`` when the insert buffer is saturated.
+        """
+
+        self.insert_debug_records([record])
+
+    def insert_debug_records(self, records: list[dict]) -> None:
+        """Queue several *debug_data* records at once – all of them or none.
+
+        Each record carries ``ip``, ``browser_info``, ``performance_data``,
+        ``fingerprints`` and ``errors``, plus optional ``network``,
+        ``battery``, ``benchmarks``, ``client_timestamp``, ``visitor_id``,
+        ``session_id`` and ``pageview_id``.  Every row is built before any is
+        queued, and ``queue.Full`` is raised without queueing anything when
+        the buffer cannot take the whole batch, so a client may safely retry.
+        """
+
+        rows: list[tuple[str, tuple]] = []
+        for record in records:
+            rows.extend(self._debug_rows(**record))
+
+        # If no database is configured we silently skip persistence so that
+        # stateless deployments (or preview environments) can continue to
+        # operate without a database.
+        try:
+            self._enqueue_many(rows)
+        except RuntimeError:
+            logger.debug("Insert skipped – database not configured.")
+
+    @staticmethod
+    def _debug_rows(
         *,
         ip: str,
         browser_info: dict,
@@ -120,42 +382,39 @@ class _Database:
         visitor_id: str | None = None,
         session_id: str | None = None,
         pageview_id: str | None = None,
-    ) -> None:
-        """Persist a single record into *debug_data* table."""
-
-        # If the pool is not initialised we silently skip persistence so that
-        # stateless deployments (or preview environments) can continue to
-        # operate without a database.
-        try:
-            sql = (
-                "INSERT INTO debug_data (ip, browser_info, performance_data, "
-                "fingerprints, errors, network, battery, benchmarks, client_timestamp, "
-                "visitor_id, session_id, pageview_id) "
-                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+    ) -> list[tuple[str, tuple]]:
+        """Return the buffered ``(table, row)`` pairs storing one record."""
+
+        rows: list[tuple[str, tuple]] = []
+
+        # Non-empty fingerprints are stored once in fingerprint_dict and
+        # referenced by hash; duplicates are dropped by ON CONFLICT.
+        fingerprint_hash = None
+        if fingerprints:
+            fingerprint_hash, body = _fingerprint_key(fingerprints)
+            rows.append(("fingerprint_dict", (fingerprint_hash, body)))
+
+        rows.append(
+            (
+                "debug_data",
+                (
+                    ip,
+                    _OrjsonJson(browser_info),
+                    _OrjsonJson(performance_data),
+                    None if fingerprint_hash is not None else _OrjsonJson(fingerprints),
+                    _OrjsonJson(errors),
+                    _OrjsonJson(network) if network else None,
+                    _OrjsonJson(battery) if battery else None,
+                    _OrjsonJson(benchmarks) if benchmarks else None,
+                    _timestamptz(client_timestamp),
+                    _text(visitor_id),
+                    _text(session_id),
+                    _text(pageview_id),
+                    fingerprint_hash,
+                ),
             )
-
-            with self.get_conn() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        sql,
-                        (
-                            ip,
-                            Json(browser_info),
-                            Json(performance_data),
-                            Json(fingerprints),
-                            Json(errors),
-                            Json(network) if network else None,
-                            Json(battery) if battery else None,
-                            Json(benchmarks) if benchmarks else None,
-                            client_timestamp,
-                            visitor_id,
-                            session_id,
-                            pageview_id,
-                        ),
-                    )
-                    conn.commit()
-        except RuntimeError:
-            logger.debug("Insert skipped – database not configured.")
+        )
+        return rows
 
     def insert_event(
         self,
@@ -172,36 +431,175 @@ class _Database:
         user_agent: str | None = None,
         payload: dict | None = None,
     ) -> None:
-        """Persist a single event into *collector_events* table."""
+        """Queue a single event for batched insertion into *collector_events*.
+
+        Raises ``queue.Full`` when the insert buffer is saturated and
+        ``ValueError`` when *seq* does not fit the INTEGER column.
+        """
+
+        if not _INT4_MIN <= seq <= _INT4_MAX:
+            raise ValueError(f"seq {seq} is outside the INTEGER range")
 
         try:
-            sql = (
-                "INSERT INTO collector_events (client_timestamp, visitor_id, session_id, "
-                "pageview_id, event_type, seq, path, referrer, ip_hash, user_agent, payload) "
-                "VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)"
+            self._enqueue(
+                "collector_events",
+                (
+                    _timestamptz(client_timestamp),
+                    visitor_id,
+                    session_id,
+                    pageview_id,
+                    event_type,
+                    seq,
+                    _text(path),
+                    _text(referrer),
+                    ip_hash,
+                    user_agent,
+                    _OrjsonJson(payload or {}),
+                ),
             )
+        except RuntimeError:
+            logger.debug("Insert skipped – database not configured.")
 
+    # ------------------------------------------------------------------
+    # Insert buffering
+    # ------------------------------------------------------------------
+    def accept_rows(self) -> None:
+        """Let the ``insert_*`` helpers queue rows before the pool is ready."""
+
+        self._accepting = True
+
+    def discard_rows(self) -> None:
+        """Stop accepting rows and drop those queued (database unavailable)."""
+
+        self._accepting = False
+        dropped = 0
+        while True:
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                break
+            dropped += 1
+        if dropped:
+            logger.error("Discarded %d buffered row(s) – database initialisation failed.", dropped)
+
+    def _enqueue(self, table: str, row: tuple) -> None:
+        """Append *row* to the insert buffer (non-blocking)."""
+
+        if not self._accepting:
+            raise RuntimeError("Database not configured.")
+        self._queue.put_nowait((table, row))
+
+    def _enqueue_many(self, rows: list[tuple[str, tuple]]) -> None:
+        """Append all *rows* to the insert buffer, or none of them.
+
+        Raises ``queue.Full`` when the buffer has room for fewer than
+        ``len(rows)`` entries.  The check and the puts happen under the
+        queue's own lock, so concurrent producers cannot interleave.
+        """
+
+        if not self._accepting:
+            raise RuntimeError("Database not configured.")
+        q = self._queue
+        with q.not_full:
+            if q.maxsize - q._qsize() < len(rows):
+                raise queue.Full
+            for row in rows:
+                q._put(row)
+            q.unfinished_tasks += len(rows)
+            q.not_empty.notify(len(rows))
+
+    def _flush_loop(self) -> None:
+        """Drain the insert buffer forever, one batch at a time."""
+
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + _BATCH_FLUSH_INTERVAL
+            while len(batch) < _BATCH_MAX_ROWS:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: list[tuple[str, tuple]]) -> None:
+        """Write *batch* with one COPY or multi-row INSERT per table and one commit.
+
+        If a row is rejected the batch is retried row by row, so one bad
+        client value costs only its own row, not everything flushed with it.
+        """
+
+        rows_by_table: dict[str, list[tuple]] = {}
+        for table, row in batch:
+            rows_by_table.setdefault(table, []).append(row)
+
+        try:
             with self.get_conn() as conn:
-                with conn.cursor() as cur:
-                    cur.execute(
-                        sql,
-                        (
-                            client_timestamp,
-                            visitor_id,
-                            session_id,
-                            pageview_id,
-                            event_type,
-                            seq,
-                            path,
-                            referrer,
-                            ip_hash,
-                            user_agent,
-                            Json(payload or {}),
-                        ),
-                    )
+                try:
+                    try:
+                        self._write_tables(conn, rows_by_table)
+                    except _ROW_ERRORS as exc:
+                        conn.rollback()
+                        logger.warning("Batch of %d row(s) rejected (%s) – retrying row by row.", len(batch), exc)
+                        self._write_rows_isolated(conn, rows_by_table)
                     conn.commit()
-        except RuntimeError:
-            logger.debug("Insert skipped – database not configured.")
+                except Exception:
+                    conn.rollback()
+                    raise
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Failed to flush %d buffered row(s): %s", len(batch), exc)
+
+    @staticmethod
+    def _write_tables(conn, rows_by_table: dict[str, list[tuple]]) -> None:
+        """Write every table's rows in bulk inside the current transaction."""
+
+        with conn.cursor() as cur:
+            # Telemetry already tolerates losing the in-memory buffer on a
+            # crash, so the commit need not wait for the WAL flush either (no
+            # risk of corruption).
+            cur.execute("SET LOCAL synchronous_commit = off")
+            can_copy = get_wait_callback() is None
+            for table, rows in rows_by_table.items():
+                if can_copy and len(rows) >= _COPY_MIN_ROWS and table not in _DICT_TABLES:
+                    lines = "".join("\t".join(map(_copy_field, row)) + "\n" for row in rows)
+                    cur.copy_expert(_BATCH_COPY_SQL[table], io.StringIO(lines))
+                else:
+                    execute_values(cur, _BATCH_INSERT_SQL[table], rows, page_size=len(rows))
+
+    @staticmethod
+    def _write_rows_isolated(conn, rows_by_table: dict[str, list[tuple]]) -> None:
+        """Insert rows one at a time under savepoints, dropping only rejected ones."""
+
+        with conn.cursor() as cur:
+            cur.execute("SET LOCAL synchronous_commit = off")
+            for table, rows in rows_by_table.items():
+                sql = _BATCH_INSERT_SQL[table]
+                for row in rows:
+                    cur.execute("SAVEPOINT batch_row")
+                    try:
+                        execute_values(cur, sql, [row])
+                    except _ROW_ERRORS as exc:
+                        cur.execute("ROLLBACK TO SAVEPOINT batch_row")
+                        logger.error("Dropped row rejected by %s: %s", table, exc)
+                    else:
+                        cur.execute("RELEASE SAVEPOINT batch_row")
+
+    def flush(self) -> None:
+        """Synchronously write every row still waiting in the insert buffer."""
+
+        if self._flusher is None:
+            return  # schema not migrated yet – nothing may be written
+
+        batch: list[tuple[str, tuple]] = []
+        while True:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if batch:
+            self._write_batch(batch)
 
 
 # -------------------------------------------------------------------------
@@ -211,22 +609,57 @@ class _Database:
 
 db = _Database()
 
+# Don't drop the tail of the buffer when the worker shuts down cleanly.
+atexit.register(db.flush)
 
-# Convenience functions ----------------------------------------------------
+# Pre-forking servers (``gunicorn --preload``) import this module once in the
+# master; every child re-opens its own connections.
+os.register_at_fork(after_in_child=db._reinit_after_fork)
 
 
-def init() -> None:
-    """Load env vars, create pool and ensure schema exists."""
+# Convenience functions ----------------------------------------------------
+
 
+def _dsn() -> str:
     dsn = os.getenv("DB_URL")
     if not dsn:
         raise RuntimeError("Environment variable DB_URL must be defined.")
+    return dsn
+
+
+def init_buffer() -> None:
+    """Start buffering inserts for the configured database.
+
+    Cheap and non-blocking, so it can run before :func:`init` has connected:
+    rows queued in between are written once the schema is migrated.  Raises
+    ``RuntimeError`` when ``DB_URL`` is not set.
+    """
+
+    _dsn()
+    db.accept_rows()
+
+
+def init() -> None:
+    """Load env vars, create pool, ensure schema exists and start flushing."""
+
+    dsn = _dsn()
+    db.accept_rows()
 
-    db.init_pool(dsn)
-    db.init_schema()
+    pool_max = os.getenv("DB_POOL_MAX")
+    try:
+        db.init_pool(dsn, maxconn=int(pool_max) if pool_max else None)
+        db.init_schema(dsn)
+    except Exception:
+        db.discard_rows()
+        raise
+    # Only now: rows flushed before the migrations ran could hit columns
+    # that do not exist yet.
+    db.start_flusher()
 
 
 # Re-export frequently used helpers for terser imports in other modules.
 get_conn = db.get_conn
 insert_debug_record = db.insert_debug_record
+insert_debug_records = db.insert_debug_records
 insert_event = db.insert_event
+pool_stats = db.pool_stats
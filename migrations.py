@@ -3,7 +3,7 @@
 Provides a lightweight, dependency-free migration runner that:
 - Tracks applied migrations in a dedicated table
 - Runs migrations in order, skipping already-applied ones
-- Wraps each migration in a transaction (rollback on failure)
+- Applies all pending migrations in one transaction (rollback on failure)
 - Logs progress to stdout
 
 Usage:
@@ -13,6 +13,7 @@ Usage:
 
 from __future__ import annotations
 
+import functools
 import logging
 import os
 from pathlib import Path
@@ -36,6 +37,11 @@ class MigrationRunner:
         self.dsn = dsn
         self.migrations_dir = migrations_dir
 
+    @functools.cached_property
+    def migration_files(self) -> list[Path]:
+        """Sorted ``.sql`` files in the migrations directory (scanned once)."""
+        return sorted(self.migrations_dir.glob("*.sql"))
+
     def _get_connection(self) -> psycopg2.extensions.connection:
         """Create a new database connection."""
         return psycopg2.connect(self.dsn)
@@ -60,31 +66,33 @@ class MigrationRunner:
             cur.execute("SELECT migration_name FROM schema_migrations ORDER BY migration_name")
             return {row[0] for row in cur.fetchall()}
 
-    def _get_pending_migrations(self) -> list[tuple[str, Path]]:
+    def _get_pending_migrations(self, conn: psycopg2.extensions.connection) -> list[tuple[str, Path]]:
         """Return sorted list of (name, path) for unapplied migrations.
 
-        Migrations are sorted by filename to ensure consistent ordering.
+        Migrations are sorted by filename to ensure consistent ordering.  The
+        on-disk names are sent as one array and PostgreSQL returns only those
+        missing from ``schema_migrations``.
         """
-        conn = self._get_connection()
-        try:
-            self._ensure_migrations_table(conn)
-            applied = self._get_applied_migrations(conn)
-        finally:
-            conn.close()
-
-        # Find all .sql files in migrations directory
-        migration_files = sorted(self.migrations_dir.glob("*.sql"))
+        self._ensure_migrations_table(conn)
 
-        pending = []
-        for migration_file in migration_files:
-            migration_name = migration_file.stem
-            if migration_name not in applied:
-                pending.append((migration_name, migration_file))
+        files_by_name = {migration_file.stem: migration_file for migration_file in self.migration_files}
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT t.name
+                FROM unnest(%s::text[]) AS t(name)
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM schema_migrations m WHERE m.migration_name = t.name
+                )
+                """,
+                (list(files_by_name),),
+            )
+            missing = {row[0] for row in cur.fetchall()}
 
-        return pending
+        return [(name, path) for name, path in files_by_name.items() if name in missing]
 
     def _apply_migration(self, conn: psycopg2.extensions.connection, migration_name: str, migration_path: Path) -> None:
-        """Apply a single migration within a transaction."""
+        """Apply a single migration inside the caller's open transaction."""
         sql = migration_path.read_text()
 
         logger.info("Applying migration: %s", migration_name)
@@ -99,21 +107,24 @@ class MigrationRunner:
                 (migration_name,),
             )
 
-        conn.commit()
-        logger.info("Successfully applied migration: %s", migration_name)
+        logger.info("Applied migration: %s", migration_name)
 
     def run(self) -> None:
-        """Run all pending migrations."""
-        pending = self._get_pending_migrations()
-
-        if not pending:
-            logger.info("No pending migrations")
-            return
-
-        logger.info("Found %d pending migration(s)", len(pending))
+        """Run all pending migrations over a single connection.
 
+        PostgreSQL DDL is transactional, so the whole batch is committed once:
+        either every pending migration is applied or none is.
+        """
         conn = self._get_connection()
         try:
+            pending = self._get_pending_migrations(conn)
+
+            if not pending:
+                logger.info("No pending migrations")
+                return
+
+            logger.info("Found %d pending migration(s)", len(pending))
+
             for migration_name, migration_path in pending:
                 try:
                     self._apply_migration(conn, migration_name, migration_path)
@@ -121,11 +132,11 @@ class MigrationRunner:
                     logger.exception("Migration failed: %s", migration_name)
                     conn.rollback()
                     raise RuntimeError(f"Migration {migration_name} failed: {exc}") from exc
+            conn.commit()
+            logger.info("All migrations applied successfully")
         finally:
             conn.close()
 
-        logger.info("All migrations applied successfully")
-
     def list_status(self) -> None:
         """Print the status of all migrations (applied vs pending)."""
         conn = self._get_connection()
@@ -135,8 +146,7 @@ class MigrationRunner:
         finally:
             conn.close()
 
-        # Find all migration files
-        migration_files = sorted(self.migrations_dir.glob("*.sql"))
+        migration_files = self.migration_files
 
         if not migration_files:
             logger.info("No migrations found in %s", self.migrations_dir)
@@ -0,0 +1,17 @@
+-- Fingerprint de-duplication
+--
+-- Fingerprint blobs are usually byte-identical across a visitor's payloads.
+-- Each distinct blob is stored once in fingerprint_dict, keyed by a 64-bit
+-- content hash; debug_data rows reference it via fingerprint_hash and leave
+-- the inline fingerprints column NULL.
+
+CREATE TABLE IF NOT EXISTS fingerprint_dict (
+    hash BIGINT PRIMARY KEY,
+    body JSONB NOT NULL,
+    first_seen TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+ALTER TABLE debug_data
+    ADD COLUMN IF NOT EXISTS fingerprint_hash BIGINT;
+
+CREATE INDEX IF NOT EXISTS idx_debug_data_fingerprint_hash ON debug_data (fingerprint_hash);
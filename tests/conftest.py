@@ -9,16 +9,36 @@ from __future__ import annotations
 
 # ruff: noqa: I001 – intentional grouping due to early stub injection
 
-import socket
+import hashlib
+import importlib.util
+import os
 import sys
 import threading
-import time
+from collections import Counter
+from collections import deque
 from contextlib import contextmanager
 from types import ModuleType
-from typing import Any, Generator, List
+from types import SimpleNamespace
+from typing import Any, Generator
 
 import pytest
 
+# Keep the test process on plain threads – gevent monkey-patching pytest (and
+# Playwright's own event loop) after start-up is not safe.
+os.environ.setdefault("COLLECTOR_ASYNC_MODE", "threading")
+
+# ---------------------------------------------------------------------------
+# Ensure *flask* is importable even in minimal CI environments – the shim
+# must be registered before anything imports ``app``.
+# ---------------------------------------------------------------------------
+
+_FLASK_STUBBED = importlib.util.find_spec("flask") is None
+
+if _FLASK_STUBBED:
+    from tests import _flask_stub
+
+    _flask_stub.install()
+
 # ---------------------------------------------------------------------------
 # Ensure *flask_socketio* is importable even when the real library isn't
 # present in the minimal CI environment.
@@ -39,6 +59,12 @@ except ModuleNotFoundError:
         def run(self, *_, **__):
             pass
 
+        def start_background_task(self, *_, **__):
+            pass
+
+        def sleep(self, *_, **__):
+            pass
+
         def on(self, _event):  # noqa: D401 – decorator shim used by app.py
             def decorator(func):  # noqa: D401
                 return func
@@ -67,37 +93,76 @@ def pytest_addoption(parser):  # noqa: D401 – pytest hook name enforced
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture(scope="session", autouse=True)
-def _patch_db() -> None:  # noqa: D401 – autouse fixture
-    """Replace db helpers with in-memory equivalents before tests import *app*."""
+def pytest_configure(config):  # noqa: D401 – pytest hook name enforced
+    """Install the in-memory *db* stub before any test module is collected."""
+
+    _install_db_stub()
+
+
+def _install_db_stub() -> None:
+    """Replace db helpers with in-memory equivalents before anything imports *app*.
+
+    ``app`` binds ``from db import insert_debug_record, …`` at import time, so
+    the patch must land before the first ``import app`` – a fixture is too late
+    once a test module imports ``app`` at collection time.  The real module is
+    patched in place rather than replaced so pure helpers such as
+    ``db._copy_field`` remain testable.
+    """
 
     import importlib
 
     db = importlib.import_module("db")
+    if hasattr(db, "_insert_counts"):
+        return  # pytest_configure can run more than once in a process
 
-    # Accumulate inserted rows here so tests can introspect.
-    _records: List[dict[str, Any]] = []
-    _event_records: List[dict[str, Any]] = []
+    # Keep only the most recent rows so tests can introspect them without the
+    # buffers growing for the whole session; totals live in a counter.
+    _records: deque[dict[str, Any]] = deque(maxlen=64)
+    _event_records: deque[dict[str, Any]] = deque(maxlen=64)
+    _insert_counts: Counter[str] = Counter()
 
     def fake_insert_debug_record(**kwargs):  # type: ignore[override]
         _records.append(kwargs)
+        _insert_counts["debug_data"] += 1
+
+    def fake_insert_debug_records(records):  # type: ignore[override]
+        for record in records:
+            fake_insert_debug_record(**record)
 
     def fake_insert_event(**kwargs):  # type: ignore[override]
-        _event_records.append(kwargs)
+        # Looked up on the module so the ``event_records`` fixture can swap it.
+        db._event_records.append(kwargs)  # type: ignore[attr-defined]
+
+    class _FakeCursor:  # noqa: D401 – accepts and ignores every statement
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *_exc):
+            return False
+
+        def execute(self, *_args, **_kwargs):
+            pass
+
+    class _FakeConn:  # noqa: D401 – enough for the /health probe
+        def cursor(self):
+            return _FakeCursor()
 
     @contextmanager
-    def fake_get_conn() -> Generator[None, None, None]:  # type: ignore[override]
-        yield None
+    def fake_get_conn() -> Generator[_FakeConn, None, None]:  # type: ignore[override]
+        yield _FakeConn()
 
     def fake_init():  # type: ignore[override]
         pass  # no-op
 
     db.insert_debug_record = fake_insert_debug_record  # type: ignore[attr-defined]
+    db.insert_debug_records = fake_insert_debug_records  # type: ignore[attr-defined]
     db.insert_event = fake_insert_event  # type: ignore[attr-defined]
     db.get_conn = fake_get_conn  # type: ignore[attr-defined]
     db.init = fake_init  # type: ignore[attr-defined]
+    db.init_buffer = fake_init  # type: ignore[attr-defined]
     db._records = _records  # type: ignore[attr-defined]
     db._event_records = _event_records  # type: ignore[attr-defined]
+    db._insert_counts = _insert_counts  # type: ignore[attr-defined]
 
 
 # ---------------------------------------------------------------------------
@@ -105,18 +170,74 @@ def _patch_db() -> None:  # noqa: D401 – autouse fixture
 # ---------------------------------------------------------------------------
 
 
-@pytest.fixture()
-def client():
-    from app import app as flask_app  # imported after DB patch
+@pytest.fixture(scope="session")
+def app_module():
+    """The ``app`` module, imported once after the db stub is installed.
+
+    Tests use it to patch module globals; ``flask_app`` is its Flask object.
+    """
+
+    import app
+    import db
+
+    # app binds the db helpers at import time – make sure it got the stubs.
+    assert app.insert_debug_record is db.insert_debug_record, "app imported before the db stub was installed"
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def flask_app(app_module):
+    """The Flask application shared by the test client and the E2E server."""
+
+    if _FLASK_STUBBED:
+        pytest.skip("Flask not installed – the import-only shim cannot serve requests")
+
+    return app_module.app
+
+
+@pytest.fixture(scope="session")
+def client(flask_app):
+    """One test client for the session – the app keeps no per-test state."""
 
     return flask_app.test_client()
 
 
+@pytest.fixture()
+def event_records(monkeypatch) -> list[dict[str, Any]]:
+    """Fresh list receiving this test's ``/event`` inserts, restored afterwards."""
+
+    import db
+
+    fresh: list[dict[str, Any]] = []
+    monkeypatch.setattr(db, "_event_records", fresh)
+    return fresh
+
+
+@pytest.fixture(scope="session")
+def ctx_lib_response(client):
+    """Fetch ``/v1/context.min.js`` once and expose the parts tests assert on."""
+
+    resp = client.get("/v1/context.min.js")
+    data = bytes(resp.data)
+    return SimpleNamespace(
+        status=resp.status_code,
+        headers=dict(resp.headers),
+        data=data,
+        sha256=hashlib.sha256(data).hexdigest(),
+    )
+
+
 # ---------------------------------------------------------------------------
 # Playwright fixtures (optional)
 # ---------------------------------------------------------------------------
 
 
+# Skip GPU/extension start-up work and keep Chromium off the (often tiny)
+# /dev/shm of CI containers.
+_CHROMIUM_ARGS = ["--disable-gpu", "--disable-dev-shm-usage", "--no-sandbox", "--disable-extensions"]
+
+
 @pytest.fixture(scope="session")
 def browser(pytestconfig):
     if pytestconfig.getoption("--skip-e2e"):
@@ -128,33 +249,66 @@ def browser(pytestconfig):
         pytest.skip("Playwright not installed", allow_module_level=True)
 
     with sync_playwright() as pw:
-        browser = pw.chromium.launch()
+        browser = pw.chromium.launch(headless=True, args=_CHROMIUM_ARGS)
         yield browser
         browser.close()
 
 
 @pytest.fixture(scope="session")
-def _flask_server(pytestconfig):
+def context(browser):
+    """One browser context shared by the whole E2E session."""
+
+    ctx = browser.new_context()
+    yield ctx
+    ctx.close()
+
+
+@pytest.fixture()
+def page(context):
+    """Fresh page per test; cookies are cleared so tests stay independent."""
+
+    pg = context.new_page()
+    yield pg
+    pg.close()
+    context.clear_cookies()
+
+
+_E2E_BASE_PORT = 58000
+
+
+def _xdist_worker_index() -> int:
+    """Return the pytest-xdist worker number (``gw3`` → 3), or 0 without xdist.
+
+    Read from the environment rather than xdist's ``worker_id`` fixture so the
+    suite keeps working when pytest-xdist is not installed.
+    """
+
+    worker = os.environ.get("PYTEST_XDIST_WORKER", "")
+    return int(worker.lstrip("gw") or 0)
+
+
+@pytest.fixture(scope="session")
+def _flask_server(pytestconfig, flask_app):
     if pytestconfig.getoption("--skip-e2e"):
         pytest.skip("--skip-e2e flag – skipping server startup")
 
-    from app import app as flask_app
+    from werkzeug.serving import make_server
 
-    port = 58000
+    port = _E2E_BASE_PORT + _xdist_worker_index()
 
-    thread = threading.Thread(
-        target=lambda: flask_app.run(host="127.0.0.1", port=port, use_reloader=False),
-        daemon=True,
-    )
-    thread.start()
+    # make_server() binds and listens before returning, so connections queue
+    # in the backlog until serve_forever() picks them up – no readiness wait
+    # is needed.  Unlike ``app.run`` it can also be shut down cleanly.
+    try:
+        server = make_server("127.0.0.1", port, flask_app, threaded=True)
+    except OSError:
+        pytest.skip("Flask test server failed to start", allow_module_level=True)
 
-    # Wait for server
-    for _ in range(50):
-        with socket.socket() as sock:
-            if sock.connect_ex(("127.0.0.1", port)) == 0:
-                break
-        time.sleep(0.1)
-    else:
-        pytest.skip("Flask dev server failed to start", allow_module_level=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
 
     yield f"http://127.0.0.1:{port}"
+
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=5)
@@ -6,30 +6,37 @@ objects that can be JSON-encoded directly and sent to the API.
 
 from __future__ import annotations
 
-import random
-import string
+import os
 from typing import Any
 from typing import Dict
 
 
 def _rand_str(n: int = 8) -> str:
-    return "".join(random.choices(string.ascii_letters, k=n))
+    return os.urandom((n + 1) // 2).hex()[:n]
+
+
+# Generated once per test session – tests check structure, not uniqueness.
+_USER_AGENT = _rand_str()
+_CANVAS = _rand_str(16)
 
 
 def sample_payload() -> Dict[str, Any]:
-    """Return a minimally valid /collect payload."""
+    """Return a minimally valid /collect payload.
+
+    A fresh dict is built on every call, so callers may mutate it freely.
+    """
 
     return {
         "timestamp": "2025-01-01T00:00:00Z",
         "browser": {
-            "userAgent": _rand_str(),
+            "userAgent": _USER_AGENT,
             "onLine": True,
         },
         "performance": {
             "resources": [],
         },
         "fingerprints": {
-            "canvas": _rand_str(16),
+            "canvas": _CANVAS,
             "fonts": ["Arial", "Helvetica"],
             "webgl": {"vendor": "Test"},
         },
@@ -37,8 +44,8 @@ def sample_payload() -> Dict[str, Any]:
     }
 
 
-def sample_event() -> Dict[str, Any]:
-    """Return a minimally valid /event payload."""
+def sample_event(payload: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    """Return a minimally valid /event payload, optionally with *payload*."""
 
     return {
         "visitor_id": "v_test",
@@ -49,5 +56,5 @@ def sample_event() -> Dict[str, Any]:
         "client_timestamp": "2025-01-01T00:00:00Z",
         "path": "/",
         "referrer": None,
-        "payload": {"k": "v"},
+        "payload": {"k": "v"} if payload is None else payload,
     }
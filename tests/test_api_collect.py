@@ -2,15 +2,116 @@
 
 from __future__ import annotations
 
-import db  # the patched instance with _records list  # type: ignore
+import json
+
+import db  # the patched instance with in-memory rows and counters  # type: ignore
 from tests.factories import sample_payload
 
 
 def test_collect_inserts_record(client):
-    before = len(db._records)  # type: ignore[attr-defined]
+    before = db._insert_counts["debug_data"]  # type: ignore[attr-defined]
 
     resp = client.post("/collect", json=sample_payload())
     assert resp.status_code == 200
 
-    after = len(db._records)  # type: ignore[attr-defined]
+    after = db._insert_counts["debug_data"]  # type: ignore[attr-defined]
     assert after == before + 1
+
+
+def test_collect_emits_timing_deltas(client, monkeypatch, app_module):
+    emitted = []
+    monkeypatch.setattr(app_module, "_socket_emit", lambda event, data: emitted.append((event, data)))
+
+    payload = sample_payload()
+    payload["errors"] = [{"message": "boom"}]
+    payload["performance"]["webVitals"] = {"LCP": 1200, "CLS": 0.01}
+    payload["performance"]["timing"] = {
+        "navigationStart": 1000,
+        "domainLookupStart": 1010,
+        "domainLookupEnd": 1030,
+        "connectStart": 0,
+        "connectEnd": 1050,
+        "responseStart": 1100,
+        "responseEnd": 1150,
+        "domContentLoadedEventEnd": 1400,
+        "loadEventEnd": 0,
+    }
+
+    resp = client.post("/collect", json=payload)
+    assert resp.status_code == 200
+
+    event, data = emitted[-1]
+    assert event == "new_payload"
+    assert data["lcp"] == 1200
+    assert data["ttfb"] == 100
+    assert data["dnsTime"] == 20
+    assert data["connectTime"] is None
+    assert data["responseTime"] == 50
+    assert data["domReady"] == 400
+    assert data["loadComplete"] is None
+    assert data["errorCount"] == 1
+
+
+def test_collect_skips_emit_without_metrics(client, monkeypatch, app_module):
+    emitted = []
+    monkeypatch.setattr(app_module, "_socket_emit", lambda event, data: emitted.append((event, data)))
+    before = db._insert_counts["debug_data"]  # type: ignore[attr-defined]
+
+    resp = client.post("/collect", json={"browser": {"userAgent": "test"}})
+    assert resp.status_code == 200
+    assert db._insert_counts["debug_data"] == before + 1  # type: ignore[attr-defined]
+    assert emitted == []
+
+
+def test_collect_accepts_ndjson_batch(client):
+    before = db._insert_counts["debug_data"]  # type: ignore[attr-defined]
+    body = b"\n".join(json.dumps(sample_payload()).encode("utf-8") for _ in range(3)) + b"\n"
+
+    resp = client.post("/collect", data=body, content_type="application/x-ndjson")
+    assert resp.status_code == 202
+    assert resp.get_json() == {"status": "accepted", "count": 3}
+    assert db._insert_counts["debug_data"] == before + 3  # type: ignore[attr-defined]
+
+
+def test_collect_rejects_malformed_ndjson_batch(client):
+    before = db._insert_counts["debug_data"]  # type: ignore[attr-defined]
+    body = json.dumps(sample_payload()).encode("utf-8") + b"\n{not json\n"
+
+    resp = client.post("/collect", data=body, content_type="application/x-ndjson")
+    assert resp.status_code == 400
+    assert db._insert_counts["debug_data"] == before  # type: ignore[attr-defined]
+
+
+def test_collect_rejects_ndjson_batch_over_record_limit(client, app_module):
+    before = db._insert_counts["debug_data"]  # type: ignore[attr-defined]
+    body = b"{}\n" * (app_module._NDJSON_MAX_RECORDS + 1)
+
+    resp = client.post("/collect", data=body, content_type="application/x-ndjson")
+    assert resp.status_code == 413
+    assert db._insert_counts["debug_data"] == before  # type: ignore[attr-defined]
+
+
+def test_collect_restarts_db_init_interrupted_by_fork(client, monkeypatch, app_module):
+    started = []
+    monkeypatch.setattr(app_module, "_db_init_done", False)
+    monkeypatch.setattr(app_module, "_db_init_pending", False)
+    monkeypatch.setattr(app_module, "_db_init_lock", app_module._db_init_lock)
+    monkeypatch.setattr(app_module, "_start_db_init", lambda: started.append(True))
+
+    app_module._db_after_fork()
+    for _ in range(2):
+        assert client.post("/collect", json=sample_payload()).status_code == 200
+    assert started == [True]
+
+
+def test_socket_emit_restarts_broadcast_loop_after_fork(monkeypatch, app_module):
+    started = []
+    monkeypatch.setattr(app_module.socketio, "start_background_task", lambda fn: started.append(fn))
+    for name in ("_EMIT_Q", "_emit_put", "_emit_loop_running"):
+        monkeypatch.setattr(app_module, name, getattr(app_module, name))
+
+    app_module._emit_after_fork()
+    app_module._socket_emit("new_payload", {"n": 1})
+    app_module._socket_emit("new_payload", {"n": 2})
+    assert started == [app_module._emit_loop]
+    assert app_module._EMIT_Q.qsize() == 2
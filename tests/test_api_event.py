@@ -1,22 +1,30 @@
 from __future__ import annotations
 
-import json
+import functools
+import hashlib
+import io
+import queue
+
+import orjson
 
-import db
 from tests.factories import sample_event
 
 
-def test_event_inserts_one_row(client):
-    db._event_records.clear()  # type: ignore[attr-defined]
+@functools.lru_cache(maxsize=1)
+def _oversize_body() -> bytes:
+    """A ~300 KiB /event JSON body, encoded once and shared by the 413 tests."""
+
+    return orjson.dumps(sample_event(payload={"blob": "x" * (300 * 1024)}))
 
+
+def test_event_inserts_one_row(client, event_records):
     payload = sample_event()
     resp = client.post("/event", json=payload)
     assert resp.status_code == 200
     assert resp.get_json() == {"status": "ok"}
 
-    assert hasattr(db, "_event_records")
-    assert len(db._event_records) == 1  # type: ignore[attr-defined]
-    row = db._event_records[0]  # type: ignore[attr-defined]
+    assert len(event_records) == 1
+    row = event_records[0]
     assert row["visitor_id"] == payload["visitor_id"]
     assert row["session_id"] == payload["session_id"]
     assert row["pageview_id"] == payload["pageview_id"]
@@ -32,10 +40,86 @@ def test_event_missing_required_returns_400(client):
 
 
 def test_event_rejects_payload_over_256kb(client):
-    big = sample_event()
-    big["payload"] = {"blob": "x" * (300 * 1024)}
+    # Hand Werkzeug the raw bytes as a stream so the 300 KiB body is not
+    # copied into the test environ; /event rejects it on Content-Length alone.
+    body = _oversize_body()
+    resp = client.open(
+        "/event",
+        method="POST",
+        input_stream=io.BytesIO(body),
+        content_length=len(body),
+        content_type="application/json",
+    )
+    assert resp.status_code == 413
+
+
+def test_event_returns_503_when_insert_buffer_full(client, monkeypatch, app_module):
+    def _full(**_kwargs):
+        raise queue.Full
+
+    monkeypatch.setattr(app_module, "insert_event", _full)
+    resp = client.post("/event", json=sample_event())
+    assert resp.status_code == 503
+
+
+def test_event_hashes_client_ip_with_salt(client, monkeypatch, event_records, app_module):
+    monkeypatch.setattr(app_module, "_IP_HASH_SALT", b"pepper")
+    app_module._compute_ip_hash.cache_clear()
+
+    resp = client.post("/event", json=sample_event(), headers={"X-Real-IP": "203.0.113.7"})
+    assert resp.status_code == 200
+
+    expected = hashlib.sha256(bytes([203, 0, 113, 7]) + b"\x00pepper").hexdigest()
+    assert event_records[-1]["ip_hash"] == expected
+    app_module._compute_ip_hash.cache_clear()
+
+
+def test_ip_hash_canonicalises_equivalent_addresses(monkeypatch, app_module):
+    monkeypatch.setattr(app_module, "_IP_HASH_SALT", b"pepper")
+    app_module._compute_ip_hash.cache_clear()
 
-    # Use raw bytes to ensure size cap is applied to request body.
-    body = json.dumps(big).encode("utf-8")
-    resp = client.post("/event", data=body, content_type="application/json")
+    assert app_module._compute_ip_hash("2001:db8::1") == app_module._compute_ip_hash("2001:0db8:0:0:0:0:0:1")
+    assert app_module._compute_ip_hash("not-an-ip") == hashlib.sha256(b"not-an-ip\x00pepper").hexdigest()
+    app_module._compute_ip_hash.cache_clear()
+
+
+def test_event_rejects_non_integer_seq(client):
+    for bad in ("1", True, 1.5, 1.0, 0.0):
+        payload = sample_event()
+        payload["seq"] = bad
+        resp = client.post("/event", json=payload)
+        assert resp.status_code == 400
+        assert resp.get_json() == {"message": "seq must be an integer"}
+
+
+def test_event_uses_first_forwarded_for_hop(client, monkeypatch, event_records, app_module):
+    monkeypatch.setattr(app_module, "_IP_HASH_SALT", b"pepper")
+    app_module._compute_ip_hash.cache_clear()
+
+    headers = {"X-Forwarded-For": " 198.51.100.1 , 10.0.0.1, 10.0.0.2"}
+    resp = client.post("/event", json=sample_event(), headers=headers)
+    assert resp.status_code == 200
+
+    expected = hashlib.sha256(bytes([198, 51, 100, 1]) + b"\x00pepper").hexdigest()
+    assert event_records[-1]["ip_hash"] == expected
+    app_module._compute_ip_hash.cache_clear()
+
+
+def test_event_rejects_oversized_body_without_content_length(client):
+    # Chunked uploads carry no Content-Length, so the size cap must be
+    # enforced while reading the stream.
+    resp = client.post(
+        "/event",
+        input_stream=io.BytesIO(_oversize_body()),
+        content_type="application/json",
+        environ_overrides={"wsgi.input_terminated": True, "CONTENT_LENGTH": ""},
+    )
     assert resp.status_code == 413
+
+
+def test_event_rejects_seq_outside_int4(client):
+    payload = sample_event()
+    payload["seq"] = 3_000_000_000
+    resp = client.post("/event", json=payload)
+    assert resp.status_code == 400
+    assert resp.get_json() == {"message": "seq out of range"}
@@ -1,16 +1,15 @@
 """Test the /v1/context.min.js static library endpoint."""
 
-import hashlib
 from pathlib import Path
 
 import pytest
 
 
-def test_context_library_serves_from_dev_path(client):
+def test_context_library_serves_from_dev_path(ctx_lib_response):
     """Test that the library is served from lib/dist/index.min.js in development."""
-    response = client.get("/v1/context.min.js")
+    response = ctx_lib_response
 
-    assert response.status_code == 200
+    assert response.status == 200
     assert response.headers["Content-Type"] == "application/javascript"
     assert response.headers["Access-Control-Allow-Origin"] == "*"
     assert "Cache-Control" in response.headers
@@ -23,25 +22,21 @@ def test_context_library_serves_from_dev_path(client):
     assert "VisitorContext" in content or "visitor" in content.lower()
 
 
-def test_context_library_etag_matches_content(client):
+def test_context_library_etag_matches_content(ctx_lib_response):
     """Test that ETag is correctly computed from file content."""
-    response = client.get("/v1/context.min.js")
-
-    assert response.status_code == 200
-    etag = response.headers.get("ETag")
+    assert ctx_lib_response.status == 200
+    etag = ctx_lib_response.headers.get("ETag")
     assert etag
 
-    # Compute hash of response body
-    computed_hash = hashlib.sha256(response.data).hexdigest()
-    assert etag == computed_hash
+    # Hash of the response body, computed once by the fixture
+    assert etag == ctx_lib_response.sha256
 
 
-def test_context_library_304_on_matching_etag(client):
+def test_context_library_304_on_matching_etag(client, ctx_lib_response):
     """Test that 304 Not Modified is returned when If-None-Match matches."""
-    # First request to get ETag
-    response1 = client.get("/v1/context.min.js")
-    assert response1.status_code == 200
-    etag = response1.headers.get("ETag")
+    # First request (shared fixture) to get ETag
+    assert ctx_lib_response.status == 200
+    etag = ctx_lib_response.headers.get("ETag")
 
     # Second request with If-None-Match
     response2 = client.get("/v1/context.min.js", headers={"If-None-Match": etag})
@@ -49,12 +44,11 @@ def test_context_library_304_on_matching_etag(client):
     assert response2.data == b""  # No body on 304
 
 
-def test_context_library_prefers_production_path(client, tmp_path, monkeypatch):
+def test_context_library_prefers_production_path(ctx_lib_response):
     """Test that static/v1/context.min.js is preferred over lib/dist/."""
     # This test would require mocking the file paths, which is complex
     # For now, we verify the route exists and serves content
-    response = client.get("/v1/context.min.js")
-    assert response.status_code == 200
+    assert ctx_lib_response.status == 200
 
 
 def test_context_library_file_exists():
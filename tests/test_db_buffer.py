@@ -0,0 +1,176 @@
+"""Row encoding helpers used by the batched insert flusher."""
+
+from __future__ import annotations
+
+import queue
+from contextlib import contextmanager
+
+import pytest
+
+import db
+
+
+def test_copy_field_encodes_nulls_json_and_escapes():
+    assert db._copy_field(None) == "\\N"
+    assert db._copy_field(7) == "7"
+    assert db._copy_field("a\tb\nc\\d\re") == "a\\tb\\nc\\\\d\\re"
+    assert db._copy_field(db._OrjsonJson({"k": "line\nbreak"})) == '{"k":"line\\\\nbreak"}'
+
+
+def test_fingerprint_key_is_order_independent():
+    h1, body = db._fingerprint_key({"canvas": "abc", "fonts": ["Arial"]})
+    h2, _ = db._fingerprint_key({"fonts": ["Arial"], "canvas": "abc"})
+    assert h1 == h2
+    assert -(2**63) <= h1 < 2**63
+    assert body == '{"canvas":"abc","fonts":["Arial"]}'
+    assert db._fingerprint_key({"canvas": "abd"})[0] != h1
+
+
+def test_timestamptz_parses_iso_and_nulls_anything_else():
+    assert db._timestamptz("2025-01-01T00:00:00.000Z").year == 2025
+    assert db._timestamptz("yesterday-ish") is None
+    assert db._timestamptz(1735689600) is None
+    assert db._timestamptz(None) is None
+
+
+class _RejectingCursor:
+    """Cursor stub that fails any statement mentioning the ``"bad"`` marker."""
+
+    def __init__(self, written):
+        self.written = written
+        self.connection = type("_Conn", (), {"encoding": "UTF8"})()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        return False
+
+    def mogrify(self, template, args):
+        return repr(args).encode()
+
+    def execute(self, sql, *_args):
+        if isinstance(sql, bytes):
+            if b"'bad'" in sql:
+                raise db.psycopg2.DataError("value out of range")
+            if b"'drift'" in sql:
+                raise db.psycopg2.ProgrammingError("column does not exist")
+            self.written.append(sql)
+
+    def copy_expert(self, sql, _file):
+        self.written.append(sql.encode())
+
+
+class _RejectingConn:
+    def __init__(self, written):
+        self.written = written
+        self.closed = 0
+        self.commits = 0
+
+    def cursor(self):
+        return _RejectingCursor(self.written)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+
+def test_write_batch_drops_only_the_rejected_row(monkeypatch):
+    written: list[bytes] = []
+    conn = _RejectingConn(written)
+
+    @contextmanager
+    def _get_conn():
+        yield conn
+
+    database = db._Database()
+    monkeypatch.setattr(database, "get_conn", _get_conn)
+    database._write_batch([("debug_data", ("ok-1",)), ("debug_data", ("bad",)), ("debug_data", ("ok-2",))])
+
+    assert conn.commits == 1
+    assert len(written) == 2
+    assert b"ok-1" in written[0] and b"ok-2" in written[1]
+
+
+def test_write_batch_does_not_retry_schema_errors_row_by_row(monkeypatch):
+    written: list[bytes] = []
+    conn = _RejectingConn(written)
+
+    @contextmanager
+    def _get_conn():
+        yield conn
+
+    database = db._Database()
+    monkeypatch.setattr(database, "get_conn", _get_conn)
+    monkeypatch.setattr(database, "_write_rows_isolated", lambda *_args: pytest.fail("retried row by row"))
+    database._write_batch([("debug_data", ("drift",)), ("debug_data", ("ok",))])
+
+    assert conn.commits == 0
+    assert written == []
+
+
+def test_large_batches_skip_copy_while_a_wait_callback_is_set():
+    from psycopg2.extensions import set_wait_callback
+    from psycopg2.extras import wait_select
+
+    rows = {"debug_data": [("ok",)] * db._COPY_MIN_ROWS}
+
+    written: list[bytes] = []
+    db._Database._write_tables(_RejectingConn(written), rows)
+    assert written[0].startswith(b"COPY")
+
+    written.clear()
+    set_wait_callback(wait_select)  # what psycogreen does under gevent
+    try:
+        db._Database._write_tables(_RejectingConn(written), rows)
+    finally:
+        set_wait_callback(None)
+    assert len(written) == 1 and written[0].startswith(b"INSERT")
+
+
+def test_insert_event_rejects_seq_outside_int4():
+    with pytest.raises(ValueError):
+        db._Database().insert_event(visitor_id="v", session_id="s", pageview_id="p", event_type="e", seq=2**31)
+
+
+def test_rows_queued_before_init_wait_for_the_flusher():
+    database = db._Database()
+    with pytest.raises(RuntimeError):
+        database._enqueue("collector_events", ())
+
+    database.accept_rows()
+    database.insert_event(visitor_id="v", session_id="s", pageview_id="p", event_type="e")
+    database.flush()  # schema not migrated yet – must not write or drop
+    assert database._queue.qsize() == 1
+
+    database.discard_rows()
+    assert database._queue.qsize() == 0
+    with pytest.raises(RuntimeError):
+        database._enqueue("collector_events", ())
+
+
+def test_insert_debug_records_queues_all_or_nothing():
+    database = db._Database()
+    database._queue = queue.Queue(maxsize=3)
+    database.accept_rows()
+    record = {"ip": "", "browser_info": {}, "performance_data": {}, "fingerprints": {"canvas": "x"}, "errors": []}
+
+    with pytest.raises(queue.Full):
+        database.insert_debug_records([record, record])  # 4 rows > 3 free slots
+    assert database._queue.qsize() == 0
+
+    database.insert_debug_record(**record)
+    assert database._queue.qsize() == 2
+
+
+def test_fork_during_init_stops_accepting_rows():
+    database = db._Database()
+    database.accept_rows()  # init() still connecting/migrating when the parent forks
+
+    database._reinit_after_fork()
+
+    assert database._flusher is None
+    with pytest.raises(RuntimeError):
+        database._enqueue("collector_events", ())
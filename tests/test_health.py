@@ -5,3 +5,29 @@ def test_health_ok(client):
     resp = client.get("/health")
     assert resp.status_code == 200
     assert resp.get_json()["status"] == "healthy"
+
+
+def test_metrics_without_database(client):
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.get_json() == {"database": "not_configured"}
+
+
+def test_health_reports_stalled_probe(client, monkeypatch, app_module):
+    import time
+
+    monkeypatch.setattr(app_module, "_health_state", (time.monotonic() - 60, app_module._HEALTHY_CONNECTED))
+    resp = client.get("/health")
+    assert resp.status_code == 503
+    assert resp.get_json()["status"] == "unhealthy"
+
+
+def test_health_restarts_probe_loop_after_fork(client, monkeypatch, app_module):
+    started = []
+    monkeypatch.setattr(app_module.socketio, "start_background_task", lambda fn: started.append(fn))
+    monkeypatch.setattr(app_module, "_health_loop_running", True)
+
+    app_module._health_after_fork()
+    client.get("/health")
+    client.get("/health")
+    assert started == [app_module._health_loop]
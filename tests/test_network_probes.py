@@ -0,0 +1,43 @@
+"""Client-side network testing endpoints (/ping, /bw)."""
+
+from __future__ import annotations
+
+
+def test_bandwidth_serves_requested_size(client):
+    resp = client.get("/bw?bytes=200000")
+    assert resp.status_code == 200
+    assert resp.headers["Content-Type"] == "application/octet-stream"
+    assert resp.headers["Content-Length"] == "200000"
+    assert resp.headers["Content-Encoding"] == "identity"
+    assert resp.headers["Cache-Control"] == "no-store"
+    assert len(resp.data) == 200_000
+    assert len(set(resp.data[:1024])) > 1  # random, not a run of one byte
+
+
+def test_bandwidth_body_is_a_stable_prefix(client):
+    small = client.get("/bw?bytes=70000").data
+    large = client.get("/bw?bytes=140000").data
+    assert large.startswith(small)
+
+
+def test_bandwidth_caps_size(client):
+    for huge in ("999999999", "9" * 5000):  # the latter exceeds int()'s digit limit
+        resp = client.get("/bw", query_string={"bytes": huge})
+        assert resp.status_code == 200
+        assert len(resp.data) == 5_000_000
+
+
+def test_bandwidth_invalid_size_uses_default(client):
+    for bad in ("abc", "-5", "\u00b2", ""):
+        resp = client.get("/bw", query_string={"bytes": bad})
+        assert resp.status_code == 200
+        assert len(resp.data) == 500_000
+
+
+def test_ping_returns_static_json(client):
+    for _ in range(2):  # the cached response must survive reuse
+        resp = client.get("/ping")
+        assert resp.status_code == 200
+        assert resp.get_json() == {"ok": True}
+        assert resp.headers["Content-Length"] == str(len(b'{"ok":true}'))
+        assert resp.headers["Cache-Control"] == "no-store"